@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga da API de lesões (flask_api.py).
+
+Sem --url, mede em processo (cliente de testes do Flask) as configurações da
+cache de respostas: sem cache, cache + json da stdlib, cache + orjson.
+Com --url, gera carga HTTP real com N conexões keep-alive contra um servidor
+já em execução (servidor de desenvolvimento, gunicorn, ...).
+
+Uso:
+    python bench_api.py --requests 2000
+    python bench_api.py --url http://localhost:5000 --concurrency 8 --duration 10
+"""
+
+import sys
+import time
+import argparse
+import threading
+import statistics
+import http.client
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+ENDPOINTS = [
+    "/api/injuries",
+    "/api/injuries?limit=20",
+    "/api/teams",
+    "/api/stats",
+    "/api/injuries/team/LAL",
+    "/api/injuries/status/out",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def report(label: str, latencies_ms: List[float], elapsed: float, errors: int = 0) -> None:
+    rps = len(latencies_ms) / elapsed if elapsed else 0.0
+    print(
+        f"  {label:<22} {rps:9.0f} req/s | p50 {statistics.median(latencies_ms):6.2f} ms | "
+        f"p99 {percentile(latencies_ms, 0.99):6.2f} ms | {len(latencies_ms)} req"
+        + (f" | ⚠️ {errors} erros" if errors else "")
+    )
+
+
+# ─── Em processo ──────────────────────────────────────────────────────────────
+
+def bench_in_process(requests_per_endpoint: int) -> None:
+    import flask_api
+
+    configs: List[Tuple[str, bool, bool]] = [("sem cache / json", False, False), ("cache / json", True, False)]
+    if flask_api.orjson is not None:
+        configs.append(("cache / orjson", True, True))
+    else:
+        print("  (orjson indisponível: pip install orjson)")
+
+    client = flask_api.app.test_client()
+    snapshot = flask_api.store.snapshot()
+    print(f"📦 {len(snapshot.injuries)} lesões | versão {snapshot.version}")
+
+    for label, cache, use_orjson in configs:
+        flask_api.RESPONSE_CACHE = cache
+        flask_api.USE_ORJSON = use_orjson
+        snapshot.responses.clear()
+
+        latencies = []
+        t_start = time.perf_counter()
+        for _ in range(requests_per_endpoint):
+            for path in ENDPOINTS:
+                t0 = time.perf_counter()
+                client.get(path)
+                latencies.append((time.perf_counter() - t0) * 1000)
+        report(label, latencies, time.perf_counter() - t_start)
+
+
+# ─── HTTP ─────────────────────────────────────────────────────────────────────
+
+def bench_http(url: str, concurrency: int, duration: float) -> int:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    deadline = time.perf_counter() + duration
+    results: Dict[int, Tuple[List[float], int]] = {}
+
+    def worker(idx: int) -> None:
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        latencies, errors, i = [], 0, idx
+        while time.perf_counter() < deadline:
+            path = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    errors += 1
+                if resp.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                    conn = http.client.HTTPConnection(host, port, timeout=10)
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+                continue
+            latencies.append((time.perf_counter() - t0) * 1000)
+        conn.close()
+        results[idx] = (latencies, errors)
+
+    print(f"🌐 {url} | {concurrency} conexões | {duration:.0f}s")
+    t_start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t_start
+
+    latencies = [ms for lat, _ in results.values() for ms in lat]
+    errors = sum(err for _, err in results.values())
+    if not latencies:
+        print("  ⚠️ nenhuma resposta (servidor em execução?)")
+        return 1
+    report("HTTP", latencies, elapsed, errors)
+    return 0 if not errors else 1
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="servidor a medir (ex: http://localhost:5000)")
+    parser.add_argument("--requests", type=int, default=1000, help="em processo: requisições por endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP: conexões simultâneas")
+    parser.add_argument("--duration", type=float, default=10.0, help="HTTP: duração em segundos")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        return bench_http(args.url, args.concurrency, args.duration)
+    bench_in_process(args.requests)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
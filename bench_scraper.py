@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do NBAExtractor sobre páginas scores24 gravadas.
+Compara os backends de parsing e verifica que a saída é idêntica; compara ainda
+o extractor de texto de passagem única com a implementação anterior.
+Com --fetch mede o pool HTTP do NetworkClient contra um servidor HTTPS local.
+
+Uso:
+    python bench_scraper.py paginas/*.html --repeat 5 --date 2026-01-20
+    python bench_scraper.py --cache .scraper_state/pages   # páginas da PageCache
+    python bench_scraper.py --synthetic --date 2026-01-19  # páginas geradas (reprodutível)
+    python bench_scraper.py --fetch --requests 60          # pool HTTP (keep-alive vs sem)
+
+Resultados de referência (--synthetic --repeat 7, mediana, 1 CPU, Python 3.11, lxml 5):
+
+    listagem 262 KB   html.parser parse 69.8 ms | extracção 155.9 ms
+                      lxml        parse 36.5 ms | extracção  96.0 ms   saída idêntica
+    artigo    89 KB   html.parser parse 20.7 ms | extracção  44.8 ms
+                      lxml        parse 15.7 ms | extracção  34.5 ms   saída idêntica
+    malformada 28 KB  html.parser parse  6.0 ms | extracção  48.3 ms
+                      lxml        parse  4.5 ms | extracção   9.1 ms   SAÍDA DIVERGENTE
+
+    Em HTML bem formado os dois backends concordam sempre; a página malformada mostra
+    que isso não basta. Por isso o html.parser continua a ser a omissão (NBA_HTML_PARSER)
+    até esta verificação passar sobre páginas reais (--cache .scraper_state/pages).
+
+    texto do artigo (_process_text_container, sem parse), saída idêntica:
+      300 secções /  89 KB   anterior  35.1 ms | passagem única 11.8 ms
+     1200 secções / 357 KB   anterior 182.6 ms | passagem única 47.2 ms
+      malformada /  28 KB    anterior  32.0 ms | passagem única 37.0 ms
+
+Pool HTTP (--fetch --requests 60, concorrência 3, 48 KB + 20 ms por resposta, loopback):
+
+    sem keep-alive          total 0.50 s | p50 23.9 ms | p90 25.8 ms
+    pool (6/3, 30s)         total 0.44 s | p50 21.3 ms | p90 21.9 ms
+
+    Em loopback o handshake TCP+TLS custa ~2.5 ms; contra o ScrapingAnt cada handshake
+    soma ainda a latência de rede, que só a telemetria de CI (latency_s) mede.
+    Com NBA_HTTP2=1 o servidor local negocia HTTP/1.1 e os números não mudam.
+"""
+
+import os
+import re
+import ssl
+import sys
+import random
+import logging
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+# O benchmark é offline: credenciais fictícias bastam para importar o módulo
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline-benchmark")
+
+from nba_scraper import (  # noqa: E402
+    Config, GameData, GameRecord, NBAExtractor, NetworkClient, PageCache, game_to_row,
+)
+
+BACKENDS = ["html.parser", "lxml"]
+
+
+def legacy_process_text_container(container, min_length=150) -> Optional[str]:
+    """Implementação anterior (find_all aninhado + dedupe em lista), mantida como referência."""
+    if not container:
+        return None
+
+    for elem in container.find_all(["button", "script", "style", "nav", "footer", "aside", "table", "form", "iframe", "ul", "ol", "a"]):
+        try:
+            elem.decompose()
+        except:
+            pass
+
+    sections = []
+    last_text = ""
+    capture_immunity = False
+
+    blacklist = {
+        "registre", "bônus", "clique aqui", "cadastre-se", "promoção",
+        "termos e condições", "lucro garantido", "telegram", "whatsapp",
+        "1xbit", "bet365", "betano", "1xbet", "pin-up",
+        "palpite pago", "vip", "cookie"
+    }
+
+    stop_triggers = [
+        "esta previsão vai ser correta", "total de votos", "bónus", "bônus",
+        "odds para o jogo", "posição na tabela", "estatísticas h2h",
+        "últimos jogos", "classificação", "outras previsões", "calcule seus",
+        "melhores odds", "welcome bonus"
+    ]
+
+    for elem in container.find_all(["p", "h2", "h3", "div", "span"]):
+
+        if elem.name in ["div", "span"] and elem.find(["p", "h2", "h3", "div"]):
+            continue
+
+        text = elem.get_text(separator=" ", strip=True)
+        if not text:
+            continue
+
+        text_lower = text.lower()
+        is_header = elem.name in ["h2", "h3"]
+
+        if any(stop in text_lower for stop in stop_triggers):
+            capture_immunity = False
+            continue
+
+        if is_header and any(trigger in text_lower for trigger in ["previsão da redação", "nossa escolha", "prognóstico", "palpite"]):
+            capture_immunity = True
+            sections.append(f"\n{text}")
+            last_text = text
+            continue
+
+        if not capture_immunity and not is_header:
+            if len(text) < 45:
+                continue
+            if any(b in text_lower for b in blacklist):
+                continue
+            num_count = sum(c.isdigit() for c in text)
+            density = num_count / len(text) if len(text) > 0 else 0
+            if density > 0.12:
+                continue
+
+        if text == last_text or text in sections:
+            continue
+
+        last_text = text
+
+        if is_header and not capture_immunity:
+            sections.append(f"\n{text}")
+        else:
+            sections.append(text)
+
+    result = "\n\n".join(sections).strip()
+    result = re.sub(r'\n{3,}', '\n\n', result)
+
+    return result if len(result) >= min_length else None
+
+
+SYNTHETIC_TEAMS = [
+    ("Boston Celtics", "celtics"), ("Miami Heat", "heat"), ("Utah Jazz", "jazz"),
+    ("Denver Nuggets", "nuggets"), ("Philadelphia 76ers", "76ers"), ("Los Angeles Lakers", "lakers"),
+    ("Golden State Warriors", "warriors"), ("New York Knicks", "knicks"),
+]
+
+
+def synthetic_pages(n_games: int = 400, n_sections: int = 300, seed: int = 7) -> List[tuple]:
+    """
+    Listagem e artigo com a estrutura das páginas scores24 (cartões com hora, logos e %,
+    artigo com secções, spans aninhados, blocos promocionais e gatilhos de paragem).
+    Deterministas, para comparar medições entre máquinas sem gravar páginas reais.
+    """
+    rng = random.Random(seed)
+    filler = "<div><p>" + "texto de enchimento " * 20 + "</p><a href='/pt/other'>o</a></div>"
+    cards = []
+    for i in range(n_games):
+        (home, h_slug), (away, a_slug) = rng.sample(SYNTHETIC_TEAMS, 2)
+        day = 17 + rng.randrange(6)
+        cards.append(
+            f"<div class='card'><a href='/pt/basketball/m-{day:02d}-01-2026-{h_slug}-{a_slug}-{i}-prediction'>"
+            f"<span>{rng.randrange(24):02d}:{rng.choice((0, 30)):02d}</span>"
+            f"<img alt='{home}' src='x.png'><img alt='{away}' src='y.png'>"
+            f"<span>{rng.randrange(40, 80)}%</span><span>Previsão</span></a></div>{filler}"
+        )
+    listing = f"<html><body><header><nav><a href='/pt'>x</a></nav></header><main>{''.join(cards)}</main></body></html>"
+
+    sections = ["<h2>Previsão da redação</h2><p>Celtics vencem.</p>"]
+    for i in range(n_sections):
+        sections.append(
+            f"<h2>Secção {i}</h2><div><p>O Boston Celtics enfrenta o Miami Heat numa partida decisiva, "
+            f"parágrafo {i} com muito texto analítico sobre defesa e ataque.</p><span>Nota curta</span>"
+            f"<div><span>Texto dentro de span aninhado que é longo o suficiente para passar o filtro {i}.</span></div>"
+            + (f"<p>Registe-se já e receba o seu bônus de boas-vindas exclusivo hoje {i}.</p>" if i % 7 == 0 else "")
+            + (f"<p>12 34 56 78 90 12 34 56 78 90 12 34 56 78 90 pontos {i}</p>" if i % 11 == 0 else "")
+            + "</div>"
+        )
+    sections.append("<h3>Outras previsões</h3><p>ignorar isto tudo agora mesmo por favor porque é lixo promocional</p>")
+    article = f"<html><body><main><article>{''.join(sections)}</article></main></body></html>"
+
+    # Marcação malformada típica (blocos dentro de <p>/<span>, <p> por fechar): é aqui
+    # que os backends divergem, ao contrário do HTML bem formado acima
+    broken = [
+        f"<h2>Secção {i}</h2><p>O Boston Celtics enfrenta o Miami Heat, parágrafo {i} sem fecho e com "
+        f"texto analítico suficiente<div>bloco dentro de p com texto longo o suficiente para o filtro {i}</div>"
+        f"<span>span com <div>div dentro de span, texto longo o bastante para passar no filtro {i}</div></span>"
+        for i in range(n_sections // 3)
+    ]
+    malformed = f"<html><body><main><article><h2>Previsão da redação</h2>{''.join(broken)}</article></main></body></html>"
+
+    return [("sintética-listagem", listing), ("sintética-artigo", article), ("sintética-malformada", malformed)]
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Mediana em milissegundos de `repeat` execuções."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def extract_output(ext: NBAExtractor, html: str, target_date: str) -> tuple:
+    games = [{k: v for k, v in game_to_row(g).items() if k != "scraped_at"} for g in ext.extract_games_list(html, target_date)]
+    text = ext._extract_text_v3(ext.parse(html))
+    return games, text
+
+
+def bench_page(name: str, html: str, target_date: str, repeat: int) -> bool:
+    print(f"\n📄 {name} ({len(html) / 1024:.0f} KB)")
+    reference = None
+    identical = True
+
+    for backend in BACKENDS:
+        ext = NBAExtractor(parser=backend)
+        if ext.parser != backend:
+            print(f"  {backend:<12} indisponível")
+            continue
+
+        parse_ms = timed(lambda: ext.parse(html), repeat)
+        full_ms = timed(lambda: extract_output(ext, html, target_date), repeat)
+        output = extract_output(ext, html, target_date)
+
+        if reference is None:
+            reference = output
+            verdict = "referência"
+        elif output == reference:
+            verdict = "saída idêntica"
+        else:
+            verdict = "⚠️ SAÍDA DIVERGENTE"
+            identical = False
+
+        print(f"  {backend:<12} parse {parse_ms:8.2f} ms | extracção {full_ms:8.2f} ms | {verdict}")
+
+    games = NBAExtractor().extract_games_list(html)
+    if games:
+        bench_game_records(games, repeat)
+
+    return bench_text_container(html, repeat) and identical
+
+
+def bench_game_records(games: List[GameRecord], repeat: int) -> None:
+    """Construção + serialização de toda a listagem: GameData validado vs GameRecord (e model_construct)."""
+    rows = [game_to_row(g) for g in games]
+
+    validated_ms = timed(lambda: [GameData(**r).model_dump() for r in rows], repeat)
+    construct_ms = timed(lambda: [game_to_row(GameData.model_construct(**r)) for r in rows], repeat)
+    record_ms = timed(lambda: [game_to_row(GameRecord(**r)) for r in rows], repeat)
+    print(
+        f"  registos     validados {validated_ms:7.2f} ms | model_construct {construct_ms:7.2f} ms | "
+        f"GameRecord {record_ms:7.2f} ms | {len(rows)} jogos"
+    )
+
+
+def bench_text_container(html: str, repeat: int) -> bool:
+    """Passagem única vs implementação anterior, sobre o mesmo contentor de artigo."""
+    ext = NBAExtractor()
+
+    def container():
+        soup = ext.parse(html)
+        return soup.find("main") or soup.find("body")
+
+    # O parse fica fora da medição: cada amostra recebe uma árvore nova (o extractor faz decompose)
+    def timed_extract(fn) -> float:
+        samples = []
+        for _ in range(repeat):
+            node = container()
+            t0 = time.perf_counter()
+            fn(node)
+            samples.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(samples)
+
+    legacy_ms = timed_extract(lambda node: legacy_process_text_container(node, min_length=300))
+    single_ms = timed_extract(lambda node: ext._process_text_container(node, min_length=300))
+    same = legacy_process_text_container(container(), 300) == ext._process_text_container(container(), 300)
+
+    verdict = "saída idêntica" if same else "⚠️ SAÍDA DIVERGENTE"
+    print(f"  texto        anterior {legacy_ms:8.2f} ms | passagem única {single_ms:8.2f} ms | {verdict}")
+    return same
+
+
+# ─── Pool HTTP ────────────────────────────────────────────────────────────────
+
+FETCH_BODY = b"<html><body>" + b"x" * 50_000 + b"</body></html>"
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Resposta de 50 KB com 20 ms de "servidor", em HTTP/1.1 com keep-alive."""
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo saem em escritas separadas: sem isto o Nagle + ACK atrasado
+    # somam ~40 ms a cada resposta e escondem o custo do handshake
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(0.02)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(FETCH_BODY)))
+        self.end_headers()
+        self.wfile.write(FETCH_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def local_https_server(workdir: str):
+    """Servidor HTTPS em localhost com certificado auto-assinado (gerado pelo openssl)."""
+    cert, key = os.path.join(workdir, "cert.pem"), os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+         "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    server.daemon_threads = True
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert, key)
+    server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, ssl.create_default_context(cafile=cert)
+
+
+async def bench_fetch_config(label: str, base_url: str, verify, n_requests: int, keepalive: int) -> None:
+    """Corre `n_requests` NetworkClient.fetch com a concorrência real e lê a FetchTelemetry."""
+    Config.HTTP_KEEPALIVE = keepalive
+    net = NetworkClient()
+    await net.client.aclose()
+    net.client = net._build_client(verify=verify)
+    # Sem pacing: mede-se o transporte, não o espaçamento entre pedidos
+    net.pacer.base_delay = net.pacer.delay = 0.0
+
+    urls = [f"{base_url}/pt/basketball/m-{i}-prediction" for i in range(n_requests)]
+    t0 = time.perf_counter()
+    pages = await asyncio.gather(*(net.fetch(u) for u in urls))
+    wall = time.perf_counter() - t0
+    await net.close()
+
+    series = net.telemetry.summary()["series"][0]
+    lat = series["latency_s"]
+    failed = sum(1 for p in pages if not p)
+    print(
+        f"  {label:<26} total {wall:6.2f} s | p50 {lat['p50'] * 1000:6.1f} ms | p90 {lat['p90'] * 1000:6.1f} ms"
+        + (f" | ⚠️ {failed} falhas" if failed else "")
+    )
+
+
+def bench_fetch(n_requests: int) -> int:
+    """Pool afinado (Config) contra pedidos sem keep-alive (handshake TCP+TLS por pedido)."""
+    # Pedido directo ao servidor local: nunca via ScrapingAnt nem a gastar créditos
+    Config.SCRAPINGANT_KEY = ""
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("nba_scraper").setLevel(logging.WARNING)
+    tuned = Config.HTTP_KEEPALIVE
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            server, verify = local_https_server(workdir)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ servidor HTTPS local indisponível (openssl?): {e}")
+            return 1
+        base_url = f"https://localhost:{server.server_address[1]}"
+        print(
+            f"\n🌐 {base_url} | {n_requests} pedidos | concorrência {Config.CONCURRENCY_LIMIT} | "
+            f"{len(FETCH_BODY) // 1024} KB + 20 ms por resposta | http2={Config.HTTP2}"
+        )
+        try:
+            asyncio.run(bench_fetch_config("sem keep-alive", base_url, verify, n_requests, 0))
+            asyncio.run(bench_fetch_config(
+                f"pool ({Config.HTTP_MAX_CONNECTIONS}/{tuned}, {Config.HTTP_KEEPALIVE_EXPIRY:.0f}s)",
+                base_url, verify, n_requests, tuned,
+            ))
+        finally:
+            Config.HTTP_KEEPALIVE = tuned
+            server.shutdown()
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="ficheiros HTML gravados (listagem ou -prediction)")
+    parser.add_argument("--cache", metavar="DIR", help="usar todas as páginas de uma PageCache")
+    parser.add_argument("--synthetic", action="store_true", help="usar páginas geradas (ver synthetic_pages)")
+    parser.add_argument("--fetch", action="store_true", help="medir o pool HTTP do NetworkClient (HTTPS local)")
+    parser.add_argument("--requests", type=int, default=60, help="--fetch: pedidos por configuração")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--date", default=time.strftime("%Y-%m-%d"), help="data alvo da listagem (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    pages = []
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    if args.cache:
+        cache = PageCache(args.cache, Config.PAGE_TTL, Config.PAGE_CACHE_MAX_AGE)
+        pages.extend((url.rsplit("/", 1)[-1], html) for url, html in cache.iter_pages())
+    if args.synthetic:
+        pages.extend(synthetic_pages())
+    if args.fetch and not pages:
+        return bench_fetch(args.requests)
+    if not pages:
+        parser.error("indique ficheiros HTML, --cache, --synthetic ou --fetch")
+
+    ok = all([bench_page(name, html, args.date, args.repeat) for name, html in pages])
+    if args.fetch:
+        ok = bench_fetch(args.requests) == 0 and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -167,17 +167,26 @@ def exemplo_8_montar_time_fantasy():
     
     print("\n📋 Verificando disponibilidade do meu time:\n")
     
+    # Páginas pequenas só com os campos necessários, seguindo o cursor até ao fim
+    lesionados = {}
+    params = {'limit': 50, 'fields': 'player_name,injury_status'}
+    while True:
+        data = requests.get(f"{API_URL}/injuries", params=params).json()
+        if not data['success']:
+            break
+        for injury in data['data']:
+            lesionados[injury['player_name'].lower()] = injury
+        if not data['next_cursor']:
+            break
+        params['cursor'] = data['next_cursor']
+    
     for player_name in meu_time:
-        response = requests.get(f"{API_URL}/search?q={player_name.split()[0]}")
-        data = response.json()
+        injury = lesionados.get(player_name.lower())
         
-        if data['success'] and data['count'] > 0:
-            # Encontrou lesão
-            injury = data['data'][0]
-            if player_name.lower() in injury['player_name'].lower():
-                print(f"⚠️  {injury['player_name']}")
-                print(f"    Status: {injury['injury_status']}")
-                print(f"    Recomendação: Considere substituir\n")
+        if injury:
+            print(f"⚠️  {injury['player_name']}")
+            print(f"    Status: {injury['injury_status']}")
+            print(f"    Recomendação: Considere substituir\n")
         else:
             print(f"✅ {player_name}")
             print(f"    Status: Disponível\n")
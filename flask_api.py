@@ -3,11 +3,31 @@ API REST para Jogadores Lesionados da NBA
 Fornece endpoints para consultar dados de lesões
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
+import os
+import base64
+import bisect
+import functools
+import gzip
+import hashlib
 import json
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import brotli  # opcional: pip install brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson  # opcional: pip install orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 CORS(app)  # Permite requisições de qualquer origem
@@ -15,16 +35,426 @@ CORS(app)  # Permite requisições de qualquer origem
 # Arquivo de dados
 DATA_FILE = "nba_injuries.json"
 
+# Respostas condicionais e compressão
+COMPRESS_MIN_BYTES = 1024       # corpos menores seguem sem compressão
+MAX_CACHED_RESPONSES = 512      # entradas por versão (LRU: buscas e cursores variados não expulsam as quentes)
+
+# Busca por nome
+SEARCH_LIMIT = 20               # resultados por padrão em /api/search
+SEARCH_MIN_SIMILARITY = 0.3     # similaridade mínima de trigramas para erros de digitação
+
+# Cache de corpos JSON já serializados (NBA_API_RESPONSE_CACHE=0 desliga)
+RESPONSE_CACHE = os.environ.get("NBA_API_RESPONSE_CACHE", "1") != "0"
+USE_ORJSON = orjson is not None and os.environ.get("NBA_API_ORJSON", "1") != "0"
+
+
+def sort_key(injury: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Chave de ordenação estável das listagens (time, jogador, id): base dos cursores."""
+    return (
+        injury.get('team_name') or '',
+        injury.get('player_name') or '',
+        str(injury.get('player_id', '')),
+    )
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas sem acentos nem pontuação: "Luka Dončić" -> "luka doncic"."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in stripped.lower()).split())
+
+
+def trigrams(folded: str) -> set:
+    """Trigramas por palavra com margens (estilo pg_trgm): "ab" -> {"  a", " ab", "ab "}."""
+    grams = set()
+    for word in folded.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """
+    Índice de nomes de jogadores montado com o snapshot: nomes normalizados
+    (sem acentos) e lista invertida trigrama -> registos. Uma busca só visita
+    os registos que partilham pelo menos um trigrama com o termo.
+    """
+
+    def __init__(self, injuries: List[Dict[str, Any]]):
+        self.records = injuries
+        self.names = [fold_text(injury.get('player_name', '')) for injury in injuries]
+        self.grams = [trigrams(name) for name in self.names]
+        self.postings: Dict[str, List[int]] = {}
+        for idx, grams in enumerate(self.grams):
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(idx)
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Registos ordenados por relevância: nome exato > prefixo > substring > semelhança."""
+        folded = fold_text(query)
+        if not folded:
+            return []
+        query_grams = trigrams(folded)
+
+        if len(folded) < 3:
+            # Termo curto demais para trigramas úteis: varrimento dos nomes normalizados
+            candidates = Counter(idx for idx, name in enumerate(self.names) if folded in name)
+        else:
+            candidates = Counter(idx for gram in query_grams for idx in self.postings.get(gram, ()))
+
+        scored = []
+        for idx, shared in candidates.items():
+            name = self.names[idx]
+            similarity = shared / (len(query_grams) + len(self.grams[idx]) - shared)
+            if name == folded:
+                score = 3.0
+            elif name.startswith(folded) or f" {folded}" in name:
+                score = 2.0 + similarity
+            elif folded in name:
+                score = 1.0 + similarity
+            elif similarity >= SEARCH_MIN_SIMILARITY:
+                score = similarity
+            else:
+                continue
+            scored.append((-score, sort_key(self.records[idx]), idx))
+
+        scored.sort()
+        return [self.records[idx] for _, _, idx in scored[:limit]]
+
+
+class ResponseCache:
+    """
+    LRU de corpos de resposta (bytes) por chave. Limitada a `max_entries`: as
+    entradas usadas há mais tempo saem primeiro, para que um fluxo de query
+    strings únicas (buscas, cursores, projeções) não bloqueie as respostas quentes.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InjurySnapshot:
+    """
+    Uma versão carregada do arquivo de lesões, com índices secundários montados
+    uma única vez no carregamento. Nunca é alterada depois de publicada.
+    """
+
+    def __init__(self, injuries: List[Dict[str, Any]], version: str = "0"):
+        self.injuries = injuries
+        self.version = version
+        # Corpos serializados/comprimidos desta versão, por ETag; descartados com o snapshot
+        self.responses = ResponseCache()
+        self.by_team: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_player: Dict[str, Dict[str, Any]] = {}
+        self.by_status: Dict[str, List[Dict[str, Any]]] = {}
+        self.fields = frozenset(key for injury in injuries for key in injury)
+
+        # Listagens paginadas por cursor: todas na ordem de `sort_key`
+        self.ordered = sorted(injuries, key=sort_key)
+        for injury in self.ordered:
+            team = (injury.get('team_abbreviation') or '').upper()
+            self.by_team.setdefault(team, []).append(injury)
+            status = (injury.get('injury_status') or '').lower()
+            self.by_status.setdefault(status, []).append(injury)
+
+        for injury in injuries:
+            # Primeira ocorrência do jogador, como na busca linear anterior
+            self.by_player.setdefault(str(injury.get('player_id', '')), injury)
+
+        self.search = SearchIndex(self.ordered)
+        self.teams = self._build_teams()
+        self.stats = self._build_stats()
+
+    def _build_teams(self) -> List[Dict[str, Any]]:
+        """Agrupamento por time ordenado por número de lesionados (/api/teams)."""
+        teams = {}
+        for injury in self.injuries:
+            team_abbr = injury.get('team_abbreviation')
+            if team_abbr:
+                if team_abbr not in teams:
+                    teams[team_abbr] = {
+                        'team_abbreviation': team_abbr,
+                        'team_name': injury.get('team_name'),
+                        'injured_count': 0,
+                        'players': []
+                    }
+
+                teams[team_abbr]['injured_count'] += 1
+                teams[team_abbr]['players'].append({
+                    'player_name': injury.get('player_name'),
+                    'position': injury.get('position'),
+                    'injury_status': injury.get('injury_status')
+                })
+
+        return sorted(teams.values(), key=lambda x: x['injured_count'], reverse=True)
+
+    def _build_stats(self) -> Dict[str, Any]:
+        """Contagens por status, time e posição numa única passagem (/api/stats)."""
+        status_count = {}
+        team_count = {}
+        position_count = {}
+        for injury in self.injuries:
+            status = injury.get('injury_status', 'Unknown')
+            status_count[status] = status_count.get(status, 0) + 1
+            team = injury.get('team_abbreviation', 'Unknown')
+            team_count[team] = team_count.get(team, 0) + 1
+            pos = injury.get('position', 'Unknown')
+            position_count[pos] = position_count.get(pos, 0) + 1
+
+        # Top 5 times com mais lesões
+        top_teams = sorted(team_count.items(), key=lambda x: x[1], reverse=True)[:5]
+
+        return {
+            'total_injuries': len(self.injuries),
+            'by_status': status_count,
+            'by_position': position_count,
+            'top_5_teams': [
+                {'team': team, 'count': count}
+                for team, count in top_teams
+            ],
+            'last_updated': self.injuries[0].get('last_updated') if self.injuries else None
+        }
+
+
+class InjuryStore:
+    """
+    Cache em memória do arquivo de lesões, partilhada por todo o processo.
+
+    O arquivo só é relido quando mtime ou tamanho mudam (verificação limitada a
+    uma por `check_interval` segundos). O novo estado é montado por inteiro e só
+    depois publicado numa única atribuição: requisições concorrentes veem sempre
+    o estado antigo completo ou o novo completo.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._snapshot = InjurySnapshot([])
+        self._last_check = float("-inf")
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def snapshot(self) -> InjurySnapshot:
+        """Versão atual (não modificar: é partilhada entre requisições)."""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._refresh(now)
+        return self._snapshot
+
+    def _refresh(self, now: float) -> None:
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return  # outra thread acabou de verificar
+            self._last_check = now
+            for _ in range(3):
+                signature = self._stat()
+                if signature == self._signature:
+                    return
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        injuries = json.load(f)
+                except FileNotFoundError:
+                    injuries = []
+                except json.JSONDecodeError:
+                    # Arquivo a meio de uma escrita: mantém o estado anterior e tenta de novo
+                    return
+                # Só publica se o arquivo não foi substituído entre o stat e a leitura:
+                # senão o conteúdo lido não corresponderia à versão (nem às ETags dela)
+                if self._stat() == signature:
+                    break
+            else:
+                return  # continua a mudar: tenta na próxima verificação
+            # Publicação atómica: a referência só muda depois do parse e dos índices.
+            # A versão deriva do arquivo (não de um contador): é estável entre
+            # reinícios e igual em todos os processos que servem o mesmo arquivo
+            version = "%x-%x" % signature if signature else "0"
+            self._snapshot = InjurySnapshot(injuries, version)
+            self._signature = signature
+
+
+store = InjuryStore(DATA_FILE)
+
 
-def load_injuries() -> List[Dict[str, Any]]:
-    """Carrega dados de lesões do arquivo JSON"""
+def current_snapshot() -> InjurySnapshot:
+    """Snapshot fixado na primeira consulta da requisição (endpoint, ETag e cache veem a mesma versão)."""
+    if 'snapshot' not in g:
+        g.snapshot = store.snapshot()
+    return g.snapshot
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serializa com orjson quando disponível; caso contrário usa o encoder do Flask."""
+    if USE_ORJSON:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (app.json.dumps(payload) + "\n").encode('utf-8')
+
+
+def cached_json(view):
+    """
+    Endpoint que devolve o payload (dict ou (dict, status)) em vez de uma Response.
+    Respostas 200 são guardadas como bytes no snapshot, pela ETag da requisição;
+    as seguintes da mesma versão saem direto da cache, sem voltar a serializar.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        snapshot = current_snapshot()
+        key = _base_etag(snapshot)
+        body = snapshot.responses.get(key) if RESPONSE_CACHE else None
+        status = 200
+        if body is None:
+            result = view(*args, **kwargs)
+            payload, status = result if isinstance(result, tuple) else (result, 200)
+            body = dumps_json(payload)
+            if RESPONSE_CACHE and status == 200:
+                snapshot.responses.put(key, body)
+        return app.response_class(body, status=status, mimetype='application/json')
+    return wrapper
+
+
+def encode_cursor(injury: Dict[str, Any]) -> str:
+    raw = json.dumps(sort_key(injury), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, str]:
+    """Inverso de `encode_cursor`; ValueError se o cursor não for válido."""
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError('cursor inválido')
+    if not isinstance(key, list) or len(key) != 3 or not all(isinstance(k, str) for k in key):
+        raise ValueError('cursor inválido')
+    return tuple(key)
+
+
+def paginate(records: List[Dict[str, Any]], default_limit: Optional[int]) -> Dict[str, Any]:
+    """
+    Aplica `limit`, `cursor` e `fields` da query string a uma lista na ordem de `sort_key`.
+    O cursor é a chave do último registo devolvido (não um offset), por isso continua
+    válido se o arquivo for recarregado entre páginas. Sem `limit` e com
+    `default_limit=None` devolve o resto da lista. ValueError para parâmetros inválidos.
+    """
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    if limit is None:
+        limit = default_limit
+    if limit is not None:
+        limit = max(1, limit)
+
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(records, decode_cursor(cursor), key=sort_key)
+    end = len(records) if limit is None else start + limit
+    page = records[start:end]
+
+    fields = request.args.get('fields')
+    if fields:
+        wanted = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in wanted if f not in current_snapshot().fields]
+        if unknown:
+            raise ValueError(f"campos desconhecidos: {', '.join(unknown)}")
+        page = [{f: injury.get(f) for f in wanted} for injury in page]
+
+    return {
+        'count': len(page),
+        'data': page,
+        'next_cursor': encode_cursor(records[end - 1]) if end < len(records) else None,
+    }
+
+
+def _base_etag(snapshot: InjurySnapshot) -> str:
+    """ETag forte da requisição atual: versão dos dados + caminho + query string."""
+    key = f"{snapshot.version}|{request.full_path}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def _pick_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+@app.before_request
+def answer_not_modified():
+    """Responde 304 sem executar o endpoint quando o cliente já tem esta versão."""
+    if request.method != 'GET' or not request.path.startswith('/api/'):
+        return None
+    if not request.if_none_match:
+        return None
+    base = _base_etag(current_snapshot())
+    # If-None-Match usa comparação fraca (RFC 9110 §13.1.2): W/"..." também conta
+    for etag in (base, f"{base}-gzip", f"{base}-br"):
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+    return None
+
+
+@app.after_request
+def add_etag_and_compress(response):
+    """ETag por versão e compressão gzip/brotli com os bytes guardados no snapshot."""
+    if (request.method != 'GET' or not request.path.startswith('/api/')
+            or response.status_code != 200 or response.direct_passthrough):
+        return response
+
+    snapshot = current_snapshot()
+    etag = _base_etag(snapshot)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+
+    encoding = _pick_encoding()
+    if encoding and response.calculate_content_length() >= COMPRESS_MIN_BYTES:
+        etag = f"{etag}-{encoding}"
+        body = snapshot.responses.get(etag)
+        if body is None:
+            raw = response.get_data()
+            if encoding == 'br':
+                body = brotli.compress(raw, quality=5)
+            else:
+                body = gzip.compress(raw, compresslevel=6)
+            snapshot.responses.put(etag, body)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    return response
 
 
 @app.route('/')
@@ -35,61 +465,67 @@ def home():
         'version': '1.0.0',
         'description': 'API para consultar jogadores lesionados da NBA',
         'endpoints': {
-            '/api/injuries': 'Lista todas as lesões',
+            '/api/injuries': 'Lista todas as lesões (limit, cursor, fields)',
             '/api/injuries/team/<abbreviation>': 'Lesões de um time específico',
             '/api/injuries/player/<player_id>': 'Lesões de um jogador específico',
             '/api/injuries/status/<status>': 'Lesões por status (Out, Day-To-Day, etc)',
             '/api/teams': 'Lista todos os times com lesões',
-            '/api/stats': 'Estatísticas gerais de lesões'
+            '/api/stats': 'Estatísticas gerais de lesões',
+            '/api/search': 'Busca jogadores por nome (q, limit)'
         },
         'timestamp': datetime.now().isoformat()
     })
 
 
 @app.route('/api/injuries')
+@cached_json
 def get_all_injuries():
     """
     Lista todas as lesões
     Query params: 
         - limit: número máximo de resultados (padrão: 100)
+        - cursor: `next_cursor` da página anterior
+        - fields: campos a devolver, separados por vírgula (ex: player_name,injury_status)
     """
-    injuries = load_injuries()
-    limit = request.args.get('limit', 100, type=int)
-    if limit is None:
-        limit = 100
-    limit = max(1, limit)
+    injuries = current_snapshot().ordered
+    try:
+        page = paginate(injuries, default_limit=100)
+    except ValueError as e:
+        return {'success': False, 'message': str(e)}, 400
     
-    return jsonify({
+    return {
         'success': True,
-        'count': len(injuries[:limit]),
         'total': len(injuries),
-        'data': injuries[:limit]
-    })
+        **page
+    }
 
 
 @app.route('/api/injuries/team/<abbreviation>')
+@cached_json
 def get_injuries_by_team(abbreviation: str):
     """
     Busca lesões de um time específico
     
     Args:
         abbreviation: Sigla do time (ex: LAL, GSW, BOS)
+    Query params: limit, cursor e fields, como em /api/injuries (sem limite por padrão)
     """
-    injuries = load_injuries()
-    team_injuries = [
-        injury for injury in injuries 
-        if injury.get('team_abbreviation', '').upper() == abbreviation.upper()
-    ]
+    team_injuries = current_snapshot().by_team.get(abbreviation.upper(), [])
+    try:
+        page = paginate(team_injuries, default_limit=None)
+    except ValueError as e:
+        return {'success': False, 'message': str(e)}, 400
     
-    return jsonify({
+    return {
         'success': True,
         'team': abbreviation.upper(),
-        'count': len(team_injuries),
-        'data': team_injuries
-    })
+        'total': len(team_injuries),
+        **page
+    }
 
 
 @app.route('/api/injuries/player/<player_id>')
+@cached_json
 def get_injury_by_player(player_id: str):
     """
     Busca lesões de um jogador específico
@@ -97,146 +533,96 @@ def get_injury_by_player(player_id: str):
     Args:
         player_id: ID do jogador na ESPN
     """
-    injuries = load_injuries()
-    player_injuries = [
-        injury for injury in injuries 
-        if str(injury.get('player_id', '')) == str(player_id)
-    ]
+    player_injury = current_snapshot().by_player.get(str(player_id))
     
-    if player_injuries:
-        return jsonify({
+    if player_injury:
+        return {
             'success': True,
             'player_id': player_id,
-            'data': player_injuries[0]
-        })
+            'data': player_injury
+        }
     else:
-        return jsonify({
+        return {
             'success': False,
             'message': 'Jogador não encontrado ou sem lesões'
-        }), 404
+        }, 404
 
 
 @app.route('/api/injuries/status/<status>')
+@cached_json
 def get_injuries_by_status(status: str):
     """
     Busca lesões por status
     
     Args:
         status: Status da lesão (Out, Day-To-Day, Questionable, etc)
+    Query params: limit, cursor e fields, como em /api/injuries (sem limite por padrão)
     """
-    injuries = load_injuries()
-    status_injuries = [
-        injury for injury in injuries 
-        if injury.get('injury_status', '').lower() == status.lower()
-    ]
+    status_injuries = current_snapshot().by_status.get(status.lower(), [])
+    try:
+        page = paginate(status_injuries, default_limit=None)
+    except ValueError as e:
+        return {'success': False, 'message': str(e)}, 400
     
-    return jsonify({
+    return {
         'success': True,
         'status': status,
-        'count': len(status_injuries),
-        'data': status_injuries
-    })
+        'total': len(status_injuries),
+        **page
+    }
 
 
 @app.route('/api/teams')
+@cached_json
 def get_teams_with_injuries():
     """Lista todos os times com jogadores lesionados"""
-    injuries = load_injuries()
-    
-    teams = {}
-    for injury in injuries:
-        team_abbr = injury.get('team_abbreviation')
-        if team_abbr:
-            if team_abbr not in teams:
-                teams[team_abbr] = {
-                    'team_abbreviation': team_abbr,
-                    'team_name': injury.get('team_name'),
-                    'injured_count': 0,
-                    'players': []
-                }
-            
-            teams[team_abbr]['injured_count'] += 1
-            teams[team_abbr]['players'].append({
-                'player_name': injury.get('player_name'),
-                'position': injury.get('position'),
-                'injury_status': injury.get('injury_status')
-            })
+    teams_list = current_snapshot().teams
     
-    teams_list = sorted(teams.values(), key=lambda x: x['injured_count'], reverse=True)
-    
-    return jsonify({
+    return {
         'success': True,
         'count': len(teams_list),
         'data': teams_list
-    })
+    }
 
 
 @app.route('/api/stats')
+@cached_json
 def get_statistics():
     """Retorna estatísticas gerais sobre lesões"""
-    injuries = load_injuries()
-    
-    # Conta por status
-    status_count = {}
-    for injury in injuries:
-        status = injury.get('injury_status', 'Unknown')
-        status_count[status] = status_count.get(status, 0) + 1
-    
-    # Conta por time
-    team_count = {}
-    for injury in injuries:
-        team = injury.get('team_abbreviation', 'Unknown')
-        team_count[team] = team_count.get(team, 0) + 1
-    
-    # Conta por posição
-    position_count = {}
-    for injury in injuries:
-        pos = injury.get('position', 'Unknown')
-        position_count[pos] = position_count.get(pos, 0) + 1
-    
-    # Top 5 times com mais lesões
-    top_teams = sorted(team_count.items(), key=lambda x: x[1], reverse=True)[:5]
-    
-    return jsonify({
+    return {
         'success': True,
-        'total_injuries': len(injuries),
-        'by_status': status_count,
-        'by_position': position_count,
-        'top_5_teams': [
-            {'team': team, 'count': count} 
-            for team, count in top_teams
-        ],
-        'last_updated': injuries[0].get('last_updated') if injuries else None
-    })
+        **current_snapshot().stats
+    }
 
 
 @app.route('/api/search')
+@cached_json
 def search_players():
     """
-    Busca jogadores por nome
+    Busca jogadores por nome (sem acentos, tolerante a erros de digitação)
     Query params:
         - q: termo de busca
+        - limit: número máximo de resultados (padrão: 20)
     """
     query = request.args.get('q', '').lower()
     
     if not query:
-        return jsonify({
+        return {
             'success': False,
             'message': 'Parâmetro "q" é obrigatório'
-        }), 400
+        }, 400
     
-    injuries = load_injuries()
-    results = [
-        injury for injury in injuries 
-        if query in injury.get('player_name', '').lower()
-    ]
+    limit = request.args.get('limit', SEARCH_LIMIT, type=int)
+    if limit is None:
+        limit = SEARCH_LIMIT
+    results = current_snapshot().search.search(query, max(1, limit))
     
-    return jsonify({
+    return {
         'success': True,
         'query': query,
         'count': len(results),
         'data': results
-    })
+    }
 
 
 @app.errorhandler(404)
@@ -273,7 +659,8 @@ if __name__ == '__main__':
     print("  • GET  /api/teams")
     print("  • GET  /api/stats")
     print("  • GET  /api/search?q=<nome>")
-    print("\n✨ Para instalar dependências: pip install flask flask-cors")
+    print("\n✨ Para instalar dependências: pip install flask flask-cors gunicorn (opcionais: orjson, brotli)")
+    print("\n🚀 Produção: gunicorn -c gunicorn.conf.py flask_api:app")
     print("=" * 60)
     print()
     
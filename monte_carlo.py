@@ -0,0 +1,222 @@
+"""
+Motor de Simulação Monte Carlo - NBA-MONITOR
+Simula dezenas de milhares de placares por jogo para a rodada inteira em
+arrays NumPy (jogos x simulações), sem laços Python por simulação.
+
+Entradas:
+  - Databallr 14D (ortg / drtg / net_poss) via `get_databallr_matrix`
+  - Métricas defensivas ESPN (defensive_rating / pace) via `get_team_defense_metrics`
+  - Linhas de mercado (spread / total) de `nba_odds_matrix`
+
+Saídas: probabilidades de cobertura do handicap e de OVER para qualquer linha.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# ─── Constantes do Modelo ────────────────────────────────────────────────────
+LEAGUE_RTG = 115.0          # pontos por 100 posses (média da liga)
+LEAGUE_PACE = 99.0          # posses por 48 minutos
+HOME_COURT_PTS = 2.5        # vantagem de mando em pontos
+TEAM_SCORE_SD = 10.5        # desvio-padrão idiossincrático por equipa
+PACE_SD = 3.0               # desvio-padrão do ritmo do jogo (choque partilhado)
+DEFAULT_SIMULATIONS = 20_000
+
+# ─── Colunas de `nba_odds_matrix` ─────────────────────────────────────────────
+# O esquema da tabela não vive neste repositório (só `matchup` é usado noutros pontos):
+# as colunas são explícitas e configuráveis, em vez de adivinhadas. Confirmar no Supabase.
+SPREAD_COLUMN = os.environ.get("NBA_ODDS_SPREAD_COLUMN", "home_spread")
+# Convenção de sinal da coluna de handicap: "home" = linha do mandante (-5.5 = mandante
+# dá 5.5 pontos); "away" = linha do visitante (invertida aqui para a do mandante)
+SPREAD_SIDE = os.environ.get("NBA_ODDS_SPREAD_SIDE", "home").lower()
+TOTAL_COLUMN = os.environ.get("NBA_ODDS_TOTAL_COLUMN", "total")
+
+_NUMBER_RE = re.compile(r"[-+]?\d+(?:[.,]\d+)?")
+
+
+def _safe_float(value, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_market_line(odds_row: Optional[dict], column: str) -> float:
+    """
+    Extrai a linha numérica de uma coluna de `nba_odds_matrix`.
+    Aceita números ou strings ("-5.5", "O 225,5"); devolve NaN se ausente.
+    """
+    raw = (odds_row or {}).get(column)
+    if raw is None:
+        return float("nan")
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    match = _NUMBER_RE.search(str(raw))
+    return float(match.group(0).replace(",", ".")) if match else float("nan")
+
+
+def home_spread_line(odds_row: Optional[dict]) -> float:
+    """Handicap do mandante, segundo `SPREAD_COLUMN` e a convenção `SPREAD_SIDE`."""
+    if SPREAD_SIDE not in ("home", "away"):
+        raise ValueError(f"NBA_ODDS_SPREAD_SIDE inválido: {SPREAD_SIDE!r} (use 'home' ou 'away')")
+    line = parse_market_line(odds_row, SPREAD_COLUMN)
+    return -line if SPREAD_SIDE == "away" else line
+
+
+def build_slate_arrays(matchups: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Converte a rodada numa estrutura de arrays alinhados por jogo.
+
+    Cada item de `matchups` deve conter `home_db`, `away_db` (Databallr),
+    `home_defense`, `away_defense` (ESPN) e opcionalmente `odds`.
+    """
+    def col(source: str, key: str, default: float, positive: bool = False) -> np.ndarray:
+        values = np.array(
+            [_safe_float((m.get(source) or {}).get(key), default) for m in matchups],
+            dtype=np.float64,
+        )
+        # Valores não finitos (ou <= 0, quando exigido) contam como ausentes
+        invalid = ~np.isfinite(values)
+        if positive:
+            invalid |= values <= 0
+        return np.where(invalid, default, values)
+
+    home_ortg = col("home_db", "ortg", LEAGUE_RTG)
+    away_ortg = col("away_db", "ortg", LEAGUE_RTG)
+
+    # DRTG: Databallr (14D) tem prioridade; a ESPN serve de fallback
+    home_drtg = col("home_db", "drtg", np.nan)
+    home_drtg = np.where(np.isnan(home_drtg), col("home_defense", "defensive_rating", LEAGUE_RTG), home_drtg)
+    away_drtg = col("away_db", "drtg", np.nan)
+    away_drtg = np.where(np.isnan(away_drtg), col("away_defense", "defensive_rating", LEAGUE_RTG), away_drtg)
+
+    # Ritmo 0 da ESPN dividiria por zero em `simulate_slate`: cai para a média da liga
+    pace = (
+        col("home_defense", "pace", LEAGUE_PACE, positive=True)
+        + col("away_defense", "pace", LEAGUE_PACE, positive=True)
+    ) / 2.0
+
+    spread = np.array([home_spread_line(m.get("odds")) for m in matchups], dtype=np.float64)
+    total = np.array([parse_market_line(m.get("odds"), TOTAL_COLUMN) for m in matchups], dtype=np.float64)
+    for m, s, t in zip(matchups, spread, total):
+        if np.isnan(s) or np.isnan(t):
+            odds = m.get("odds") or {}
+            missing = [c for c, v in ((SPREAD_COLUMN, s), (TOTAL_COLUMN, t)) if np.isnan(v)]
+            print(
+                f"⚠️ Linha de mercado ilegível para '{odds.get('matchup', '?')}': "
+                f"{', '.join(missing)} (colunas disponíveis: {sorted(odds)})"
+            )
+
+    return {
+        "home_ortg": home_ortg,
+        "away_ortg": away_ortg,
+        "home_drtg": home_drtg,
+        "away_drtg": away_drtg,
+        "pace": pace,
+        "spread": spread,
+        "total": total,
+    }
+
+
+def expected_points(slate: Dict[str, np.ndarray]) -> tuple:
+    """Projeção média cruzada: ORTG de um lado vs DRTG do outro, escalada pelo ritmo."""
+    home_rtg = (slate["home_ortg"] + slate["away_drtg"]) / 2.0
+    away_rtg = (slate["away_ortg"] + slate["home_drtg"]) / 2.0
+    home_mu = home_rtg * slate["pace"] / 100.0 + HOME_COURT_PTS / 2.0
+    away_mu = away_rtg * slate["pace"] / 100.0 - HOME_COURT_PTS / 2.0
+    return home_mu, away_mu
+
+
+def simulate_slate(
+    slate: Dict[str, np.ndarray],
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+) -> tuple:
+    """
+    Gera placares simulados com shape (jogos, n_sims).
+    O ritmo é um choque partilhado pelas duas equipas (correlaciona o total);
+    o restante ruído é independente por equipa.
+    """
+    rng = np.random.default_rng(seed)
+    home_mu, away_mu = expected_points(slate)
+    n_games = home_mu.shape[0]
+
+    pace = slate["pace"][:, None]
+    pace_factor = (pace + PACE_SD * rng.standard_normal((n_games, n_sims))) / pace
+    noise = rng.standard_normal((2, n_games, n_sims)) * TEAM_SCORE_SD
+
+    home_pts = home_mu[:, None] * pace_factor + noise[0]
+    away_pts = away_mu[:, None] * pace_factor + noise[1]
+    return home_pts, away_pts
+
+
+def cover_probabilities(home_pts: np.ndarray, away_pts: np.ndarray, home_spreads) -> np.ndarray:
+    """
+    P(mandante cobre) para uma ou várias linhas de handicap do mandante.
+    `home_spreads` com shape (jogos,) ou (jogos, linhas); NaN propaga NaN.
+    """
+    spreads = np.asarray(home_spreads, dtype=np.float64)
+    squeeze = spreads.ndim == 1
+    spreads = spreads.reshape(spreads.shape[0], -1)
+    margin = (home_pts - away_pts)[:, :, None]
+    probs = (margin + spreads[:, None, :] > 0).mean(axis=1)
+    probs = np.where(np.isnan(spreads), np.nan, probs)
+    return probs[:, 0] if squeeze else probs
+
+
+def over_probabilities(home_pts: np.ndarray, away_pts: np.ndarray, totals) -> np.ndarray:
+    """P(OVER) para uma ou várias linhas de total; mesmo contrato de `cover_probabilities`."""
+    lines = np.asarray(totals, dtype=np.float64)
+    squeeze = lines.ndim == 1
+    lines = lines.reshape(lines.shape[0], -1)
+    total = (home_pts + away_pts)[:, :, None]
+    probs = (total > lines[:, None, :]).mean(axis=1)
+    probs = np.where(np.isnan(lines), np.nan, probs)
+    return probs[:, 0] if squeeze else probs
+
+
+def _rounded(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def run_slate_simulation(
+    matchups: List[dict],
+    n_sims: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+) -> List[dict]:
+    """
+    Pipeline completo: arrays da rodada -> simulação -> probabilidades por jogo.
+    Devolve um dict por jogo, na mesma ordem de `matchups`, pronto para o payload.
+    """
+    if not matchups:
+        return []
+
+    slate = build_slate_arrays(matchups)
+    home_pts, away_pts = simulate_slate(slate, n_sims=n_sims, seed=seed)
+
+    margin = home_pts - away_pts
+    total = home_pts + away_pts
+    p_cover = cover_probabilities(home_pts, away_pts, slate["spread"])
+    p_over = over_probabilities(home_pts, away_pts, slate["total"])
+    p_home_win = (margin > 0).mean(axis=1)
+
+    return [
+        {
+            "simulacoes": n_sims,
+            "placar_medio_casa": round(float(home_pts[i].mean()), 1),
+            "placar_medio_fora": round(float(away_pts[i].mean()), 1),
+            "total_projetado": round(float(total[i].mean()), 1),
+            "margem_projetada_casa": round(float(margin[i].mean()), 1),
+            "prob_vitoria_casa": round(float(p_home_win[i]), 3),
+            "linha_spread_casa": _rounded(slate["spread"][i]),
+            "prob_cobertura_casa": _rounded(p_cover[i]),
+            "linha_total": _rounded(slate["total"][i]),
+            "prob_over": _rounded(p_over[i]),
+        }
+        for i in range(len(matchups))
+    ]
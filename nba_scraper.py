@@ -8,16 +8,25 @@ Correcções e Optimizacões:
 
 import os
 import re
+import gzip
+import math
+import json
+import time
+import hashlib
 import logging
 import asyncio
 import httpx
+from collections import deque
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
-from typing import List, Optional, Dict, Any, Set
-from urllib.parse import quote
+from typing import List, Optional, Dict, Any, Set, Tuple
+from urllib.parse import quote, urlparse
 
-from bs4 import BeautifulSoup
-from pydantic import BaseModel, Field
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+from pydantic import BaseModel, Field, ValidationError
 from supabase import create_client, Client
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
@@ -32,19 +41,74 @@ ET  = ZoneInfo("America/New_York")
 
 
 # ─── Configuração ─────────────────────────────────────────────────────────────
-def _require_env(name: str) -> str:
+def _require_env(name: str, required: bool = True) -> str:
     val = os.environ.get(name, "").strip()
-    if not val:
+    if not val and required:
         raise EnvironmentError(f"❌ Secret ausente: {name}")
     return val
 
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+# Offline: nenhum pedido de rede; o extractor corre sobre o HTML em cache (reprocessamento/benchmarks).
+# Só grava no Supabase (e só então exige as credenciais) com NBA_SCRAPER_OFFLINE_WRITE=1.
+_OFFLINE       = _env_flag("NBA_SCRAPER_OFFLINE")
+_OFFLINE_WRITE = _env_flag("NBA_SCRAPER_OFFLINE_WRITE")
+_DB_ENABLED    = not _OFFLINE or _OFFLINE_WRITE
+
 class Config:
-    SUPABASE_URL     = _require_env("SUPABASE_URL")
-    SUPABASE_KEY     = _require_env("SUPABASE_SERVICE_KEY")
+    SUPABASE_URL     = _require_env("SUPABASE_URL", required=_DB_ENABLED)
+    SUPABASE_KEY     = _require_env("SUPABASE_SERVICE_KEY", required=_DB_ENABLED)
     SCRAPINGANT_KEY  = os.environ.get("SCRAPINGANT_API_KEY", "")
     BASE_URL         = "https://scores24.live"
     PREDICTIONS_URL  = f"{BASE_URL}/pt/basketball/l-usa-nba"
     CONCURRENCY_LIMIT = 3
+    # Pool HTTP: keepalive alinhado com a concorrência; timeouts separados (o render browser é lento).
+    # Medição reprodutível: python bench_scraper.py --fetch (servidor TLS local, FetchTelemetry).
+    # HTTP/2 fica desligado por omissão até a telemetria de CI (http_versions) mostrar ganho.
+    HTTP_MAX_CONNECTIONS  = int(os.environ.get("NBA_HTTP_MAX_CONNECTIONS", CONCURRENCY_LIMIT * 2))
+    HTTP_KEEPALIVE        = int(os.environ.get("NBA_HTTP_KEEPALIVE", CONCURRENCY_LIMIT))
+    HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("NBA_HTTP_KEEPALIVE_EXPIRY", 30.0))
+    HTTP_CONNECT_TIMEOUT  = float(os.environ.get("NBA_HTTP_CONNECT_TIMEOUT", 10.0))
+    HTTP_READ_TIMEOUT     = float(os.environ.get("NBA_HTTP_READ_TIMEOUT", 60.0))
+    HTTP2                 = os.environ.get("NBA_HTTP2", "0").lower() in ("1", "true", "yes")
+    PACING_BASE_DELAY = 0.5    # espaçamento mínimo entre pedidos (s)
+    PACING_MAX_DELAY  = 30.0   # tecto do espaçamento após 409/429 (s)
+    # html.parser por omissão: o lxml é ~2x mais rápido, mas reconstrói de outra forma o HTML
+    # malformado (blocos dentro de <p>/<span>, tags por fechar) e a saída diverge; só deve
+    # passar a omissão depois de bench_scraper.py confirmar saída idêntica em páginas reais
+    HTML_PARSER       = os.environ.get("NBA_HTML_PARSER", "html.parser")
+    STATE_DIR         = os.environ.get("NBA_SCRAPER_STATE_DIR", ".scraper_state")
+    FETCH_MODES_FILE  = os.path.join(STATE_DIR, "fetch_modes.json")
+    CONTAINER_PATHS_FILE = os.path.join(STATE_DIR, "container_paths.json")
+    # Orçamento ScrapingAnt (créditos por pedido; limites 0 = sem limite)
+    CREDIT_COST       = {
+        False: int(os.environ.get("SCRAPINGANT_COST_STATIC", 1)),
+        True:  int(os.environ.get("SCRAPINGANT_COST_BROWSER", 10)),
+    }
+    CREDIT_BUDGET_RUN = int(os.environ.get("NBA_CREDIT_BUDGET_RUN", 0))
+    CREDIT_BUDGET_DAY = int(os.environ.get("NBA_CREDIT_BUDGET_DAY", 0))
+    CREDITS_FILE      = os.path.join(STATE_DIR, "credits.json")
+    TELEMETRY_JSON    = os.environ.get("NBA_TELEMETRY_JSON", "fetch_telemetry.json")
+    TELEMETRY_PROM    = os.environ.get("NBA_TELEMETRY_PROM", "nba_scraper.prom")
+    PAGE_CACHE_DIR    = os.path.join(STATE_DIR, "pages")
+    PAGE_TTL          = {
+        "listing":    int(os.environ.get("NBA_CACHE_TTL_LISTING", 15 * 60)),
+        "prediction": int(os.environ.get("NBA_CACHE_TTL_PREDICTION", 24 * 3600)),
+    }
+    PAGE_CACHE_MAX_AGE = 7 * 24 * 3600
+    OFFLINE           = _OFFLINE
+    OFFLINE_WRITE     = _OFFLINE_WRITE
+    DB_ENABLED        = _DB_ENABLED
+    TARGET_DATE       = os.environ.get("NBA_SCRAPER_DATE", "")
+    # Multi-dia: uma única captura da listagem alimenta todas as datas presentes (até N dias à frente)
+    MULTI_DAY         = os.environ.get("NBA_SCRAPER_MULTI_DAY", "").lower() in ("1", "true", "yes")
+    MULTI_DAY_HORIZON = int(os.environ.get("NBA_SCRAPER_MULTI_DAY_HORIZON", 3))
+    # Artigos só até N dias à frente (0 = hoje); os restantes dias entram só como agenda.
+    # Os artigos mais distantes raramente estão publicados e cada tentativa gasta créditos.
+    MULTI_DAY_ARTICLE_DAYS = int(os.environ.get("NBA_SCRAPER_ARTICLE_DAYS", 1))
+    # Processos dedicados ao parsing dos artigos (0 = parsing inline no event loop)
+    PARSE_WORKERS     = int(os.environ.get("NBA_PARSE_WORKERS", os.cpu_count() or 1))
 
 
 # ─── Modelos ──────────────────────────────────────────────────────────────────
@@ -65,27 +129,535 @@ class GameData(BaseModel):
     tactical_prediction: Optional[str] = None
 
 
+@dataclass(slots=True)
+class GameRecord:
+    """
+    Registo interno do pipeline (listagem -> artigo -> persistência), sem custo de validação.
+    Espelha GameData; a validação pydantic corre uma única vez, em DatabaseManager.upsert_games.
+    """
+    slug: str
+    game_date: str
+    game_time_brt: str
+    home_team: str
+    away_team: str
+    home_team_pt: str
+    away_team_pt: str
+    home_tri: str
+    away_tri: str
+    source_url: str
+    confidence_pct: Optional[int] = None
+    game_status: str = "Scheduled"
+    scraped_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    tactical_prediction: Optional[str] = None
+
+
+# Colunas de nba_games_schedule, na ordem do modelo
+GAME_COLUMNS = tuple(GameData.model_fields)
+_ROW_VALUES = attrgetter(*GAME_COLUMNS)
+
+# GameRecord repete os campos à mão: falha no import se divergir de GameData (não um assert, que -O remove)
+if tuple(f.name for f in fields(GameRecord)) != GAME_COLUMNS:
+    raise TypeError(
+        f"GameRecord diverge de GameData: {[f.name for f in fields(GameRecord)]} != {list(GAME_COLUMNS)}"
+    )
+
+
+def game_to_row(game) -> Dict[str, Any]:
+    """Serialização directa (GameRecord ou GameData) para a linha SQL, num único attrgetter."""
+    return dict(zip(GAME_COLUMNS, _ROW_VALUES(game)))
+
+
 # ─── Rede ─────────────────────────────────────────────────────────────────────
+class AdaptivePacer:
+    """
+    Espaçamento global entre pedidos partilhado por todas as tarefas.
+    Cresce multiplicativamente com 409/429 (ou Retry-After) e decai com sucessos.
+    """
+    THROTTLE_STATUSES = {409, 429}
+
+    def __init__(self, base_delay: float, max_delay: float, backoff: float = 2.0, recovery: float = 0.8):
+        self.base_delay = base_delay
+        self.max_delay  = max_delay
+        self.backoff    = backoff
+        self.recovery   = recovery
+        self.delay      = base_delay
+        self._next_slot = 0.0
+        self._lock      = asyncio.Lock()
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def penalize(self, retry_after: Optional[str] = None) -> None:
+        try:
+            hinted = float(retry_after) if retry_after else 0.0
+        except ValueError:
+            hinted = 0.0
+        self.delay = min(self.max_delay, max(self.delay * self.backoff, hinted))
+        log.warning(f"Pacing adaptativo: espaçamento elevado para {self.delay:.1f}s")
+
+    def reward(self) -> None:
+        self.delay = max(self.base_delay, self.delay * self.recovery)
+
+
+def url_class(url: str) -> str:
+    """Classe de página para estatísticas e cache: artigo (-prediction) ou listagem."""
+    return "prediction" if url.rstrip("/").endswith("-prediction") else "listing"
+
+
+class FetchModeLearner:
+    """
+    Aprende, por classe de URL, qual o modo de fetch ScrapingAnt que funciona
+    (browser=False custa 1 crédito, browser=True custa 10) e persiste entre execuções.
+    O histórico é uma janela deslizante, para reagir a mudanças do site.
+    """
+    MODE_COST        = Config.CREDIT_COST
+    DEFAULT_ORDER    = [True, False]    # sem histórico: comportamento original (browser primeiro)
+    WINDOW           = 20
+    MIN_SUCCESS_RATE = 0.5
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # {classe: {"browser"/"static": {"outcomes": deque[bool], "latencies": deque[float]}}}
+        self.stats: Dict[str, Dict[str, Dict[str, deque]]] = {}
+        # Amostras acrescentadas nesta execução por (classe, modo): localiza uma amostra na janela
+        self._appended: Dict[Tuple[str, str], int] = {}
+
+    @staticmethod
+    def _key(use_browser: bool) -> str:
+        return "browser" if use_browser else "static"
+
+    @classmethod
+    def load(cls, path: str) -> "FetchModeLearner":
+        learner = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            for klass, modes in raw.items():
+                for mode, data in modes.items():
+                    entry = learner._entry(klass, mode)
+                    entry["outcomes"].extend(bool(o) for o in data.get("outcomes", []))
+                    entry["latencies"].extend(float(l) for l in data.get("latencies", []))
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+            log.warning(f"Estado de modos de fetch ilegível ({e}). A recomeçar do zero.")
+        return learner
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        payload = {
+            klass: {mode: {k: list(v) for k, v in entry.items()} for mode, entry in modes.items()}
+            for klass, modes in self.stats.items()
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+
+    def _entry(self, klass: str, mode: str) -> Dict[str, deque]:
+        modes = self.stats.setdefault(klass, {})
+        return modes.setdefault(mode, {
+            "outcomes": deque(maxlen=self.WINDOW),
+            "latencies": deque(maxlen=self.WINDOW),
+        })
+
+    def success_rate(self, klass: str, use_browser: bool) -> Optional[float]:
+        outcomes = self.stats.get(klass, {}).get(self._key(use_browser), {}).get("outcomes")
+        if not outcomes:
+            return None
+        return sum(outcomes) / len(outcomes)
+
+    def plan(self, url: str) -> List[bool]:
+        """Ordem de tentativa: modos que têm funcionado, do mais barato ao mais caro; depois os restantes."""
+        klass = url_class(url)
+        proven = sorted(
+            (m for m in self.MODE_COST if (self.success_rate(klass, m) or 0) >= self.MIN_SUCCESS_RATE),
+            key=self.MODE_COST.get,
+        )
+        rest = [m for m in self.DEFAULT_ORDER if m not in proven]
+        return proven + rest
+
+    def record(self, url: str, use_browser: bool, ok: bool, latency: float) -> Tuple[str, str, int]:
+        """Regista uma tentativa; devolve o identificador da amostra (para `reject`)."""
+        key = (url_class(url), self._key(use_browser))
+        entry = self._entry(*key)
+        entry["outcomes"].append(ok)
+        entry["latencies"].append(round(latency, 3))
+        self._appended[key] = self._appended.get(key, 0) + 1
+        return key + (self._appended[key],)
+
+    def reject(self, sample: Tuple[str, str, int]) -> None:
+        """
+        O HTML dessa tentativa não serviu (ex.: página sem o artigo renderizado):
+        o sucesso HTTP registado passa a falha. Só mexe nessa amostra, mesmo com
+        fetches concorrentes a acrescentar outras entretanto.
+        """
+        klass, mode, seq = sample
+        outcomes = self._entry(klass, mode)["outcomes"]
+        idx = len(outcomes) - 1 - (self._appended.get((klass, mode), 0) - seq)
+        if idx >= 0:
+            outcomes[idx] = False
+
+    def report(self) -> None:
+        for klass, modes in sorted(self.stats.items()):
+            for mode, entry in sorted(modes.items()):
+                outcomes, latencies = entry["outcomes"], entry["latencies"]
+                if not outcomes:
+                    continue
+                rate = 100 * sum(outcomes) / len(outcomes)
+                avg = sum(latencies) / len(latencies) if latencies else 0.0
+                log.info(
+                    f"  → Modo {klass}/{mode}: sucesso {rate:.0f}% "
+                    f"({len(outcomes)} amostras) | latência média {avg:.1f}s"
+                )
+
+
+class PageCache:
+    """
+    Cache local de HTML, comprimido (gzip) e endereçado por conteúdo:
+    o índice mapeia (URL, modo) -> sha256, e cada corpo é guardado uma única vez em blobs/.
+    O TTL depende da classe de URL: listagem curta, artigos -prediction longa.
+    """
+
+    def __init__(self, root: str, ttl: Dict[str, int], max_age: int):
+        self.root = root
+        self.ttl = ttl
+        self.max_age = max_age
+        self.index_path = os.path.join(root, "index.json")
+        self.index: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            log.warning(f"Índice da cache de páginas corrompido ({e}). A recomeçar do zero.")
+
+    @staticmethod
+    def _key(url: str, use_browser: bool) -> str:
+        return f"{'browser' if use_browser else 'static'} {url}"
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.html.gz")
+
+    def _read(self, entry: Dict[str, Any]) -> Optional[str]:
+        try:
+            with gzip.open(self._blob_path(entry["sha256"]), "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, KeyError):
+            return None
+
+    def get(self, url: str, use_browser: bool) -> Optional[str]:
+        entry = self.index.get(self._key(url, use_browser))
+        if not entry or time.time() - entry.get("fetched_at", 0) > self.ttl[url_class(url)]:
+            return None
+        return self._read(entry)
+
+    def latest(self, url: str) -> Optional[str]:
+        """Cópia mais recente em qualquer modo, ignorando o TTL (modo offline)."""
+        entries = [e for e in (self.index.get(self._key(url, m)) for m in (False, True)) if e]
+        for entry in sorted(entries, key=lambda e: e.get("fetched_at", 0), reverse=True):
+            html = self._read(entry)
+            if html:
+                return html
+        return None
+
+    def put(self, url: str, use_browser: bool, html: str) -> None:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self.index[self._key(url, use_browser)] = {"url": url, "sha256": digest, "fetched_at": time.time()}
+
+    def invalidate(self, url: str) -> None:
+        for use_browser in (False, True):
+            self.index.pop(self._key(url, use_browser), None)
+
+    def iter_pages(self):
+        """(url, html) de cada corpo distinto no índice — alimenta reprocessamento e benchmarks."""
+        seen: Set[str] = set()
+        for entry in list(self.index.values()):
+            if entry.get("sha256") in seen:
+                continue
+            seen.add(entry.get("sha256"))
+            html = self._read(entry)
+            if html:
+                yield entry["url"], html
+
+    def save(self) -> None:
+        """Persiste o índice (escrita atómica) e remove entradas expiradas e blobs órfãos."""
+        now = time.time()
+        self.index = {k: e for k, e in self.index.items() if now - e.get("fetched_at", 0) <= self.max_age}
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+        live = {e["sha256"] for e in self.index.values()}
+        blobs_dir = os.path.join(self.root, "blobs")
+        for dirpath, _, files in os.walk(blobs_dir):
+            for name in files:
+                if name.endswith(".html.gz") and name[:-len(".html.gz")] not in live:
+                    os.remove(os.path.join(dirpath, name))
+
+
+class CreditBudget:
+    """
+    Contabilidade de créditos ScrapingAnt por execução e por dia (persistida em disco).
+    Cada tentativa é cobrada antes de sair (estimativa conservadora: falhas também contam).
+    """
+
+    def __init__(self, path: Optional[str], costs: Dict[bool, int], per_run: int, per_day: int):
+        self.path = path
+        self.costs = costs
+        self.per_run = per_run
+        self.per_day = per_day
+        self.day = datetime.now(BRT).strftime("%Y-%m-%d")
+        self.used_run = 0
+        self.used_day = 0
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("date") == self.day:
+                    self.used_day = int(state.get("used", 0))
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, ValueError, AttributeError) as e:
+                log.warning(f"Registo de créditos ilegível ({e}). A recomeçar do zero.")
+
+    def remaining(self) -> Optional[int]:
+        limits = []
+        if self.per_run:
+            limits.append(self.per_run - self.used_run)
+        if self.per_day:
+            limits.append(self.per_day - self.used_day)
+        return min(limits) if limits else None
+
+    def affordable(self, use_browser: bool) -> bool:
+        left = self.remaining()
+        return left is None or self.costs[use_browser] <= left
+
+    def try_charge(self, use_browser: bool) -> bool:
+        if not self.affordable(use_browser):
+            return False
+        self.used_run += self.costs[use_browser]
+        self.used_day += self.costs[use_browser]
+        return True
+
+    def report(self) -> None:
+        run_limit = self.per_run or "∞"
+        day_limit = self.per_day or "∞"
+        log.info(
+            f"  → Créditos ScrapingAnt: {self.used_run}/{run_limit} nesta execução | "
+            f"{self.used_day}/{day_limit} hoje ({self.day})"
+        )
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"date": self.day, "used": self.used_day}, f)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rank mais próximo; lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class FetchTelemetry:
+    """
+    Um evento estruturado por tentativa HTTP (classe de URL, modo, estado, tentativa,
+    latência, bytes, motivo de retry). No fim da execução agrega percentis e taxas de
+    sucesso num resumo JSON e num textfile Prometheus (node_exporter textfile collector).
+    """
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.started_at = datetime.now(timezone.utc).isoformat()
+
+    def record(self, url: str, use_browser: bool, attempt: int, status: Any,
+               latency: float, nbytes: int = 0, retry_reason: Optional[str] = None,
+               http_version: Optional[str] = None) -> None:
+        self.events.append({
+            "url_class": url_class(url),
+            "mode": FetchModeLearner._key(use_browser),
+            "status": status,
+            "attempt": attempt,
+            "latency_s": round(latency, 4),
+            "bytes": nbytes,
+            "retry_reason": retry_reason,
+            "http_version": http_version,
+            "ok": status == 200,
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for ev in self.events:
+            groups.setdefault((ev["url_class"], ev["mode"]), []).append(ev)
+
+        series = []
+        for (klass, mode), events in sorted(groups.items()):
+            latencies = sorted(ev["latency_s"] for ev in events)
+            statuses: Dict[str, int] = {}
+            reasons: Dict[str, int] = {}
+            versions: Dict[str, int] = {}
+            for ev in events:
+                if ev["http_version"]:
+                    versions[ev["http_version"]] = versions.get(ev["http_version"], 0) + 1
+                statuses[str(ev["status"])] = statuses.get(str(ev["status"]), 0) + 1
+                if ev["retry_reason"]:
+                    reasons[ev["retry_reason"]] = reasons.get(ev["retry_reason"], 0) + 1
+            ok = sum(ev["ok"] for ev in events)
+            series.append({
+                "url_class": klass,
+                "mode": mode,
+                "requests": len(events),
+                "success_rate": round(ok / len(events), 4),
+                "latency_s": {f"p{p}": _percentile(latencies, p) for p in self.PERCENTILES},
+                "latency_sum_s": round(sum(latencies), 3),
+                "bytes_total": sum(ev["bytes"] for ev in events),
+                "statuses": statuses,
+                "retry_reasons": reasons,
+                "http_versions": versions,
+            })
+
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "requests": len(self.events),
+            "series": series,
+            "events": self.events,
+        }
+
+    def _prometheus_lines(self, summary: Dict[str, Any]) -> List[str]:
+        lines = [
+            # Valores da última execução (recomeçam a cada run): gauges, sem o sufixo _total dos counters
+            "# HELP nba_scraper_fetch_requests Tentativas HTTP na última execução.",
+            "# TYPE nba_scraper_fetch_requests gauge",
+        ]
+        for s in summary["series"]:
+            for status, count in sorted(s["statuses"].items()):
+                lines.append(
+                    f'nba_scraper_fetch_requests{{url_class="{s["url_class"]}",mode="{s["mode"]}",status="{status}"}} {count}'
+                )
+        lines += [
+            "# HELP nba_scraper_fetch_success_ratio Fracção de tentativas com HTTP 200.",
+            "# TYPE nba_scraper_fetch_success_ratio gauge",
+        ]
+        lines += [
+            f'nba_scraper_fetch_success_ratio{{url_class="{s["url_class"]}",mode="{s["mode"]}"}} {s["success_rate"]}'
+            for s in summary["series"]
+        ]
+        lines += [
+            "# HELP nba_scraper_fetch_latency_seconds Latência por tentativa (percentis da última execução).",
+            "# TYPE nba_scraper_fetch_latency_seconds summary",
+        ]
+        for s in summary["series"]:
+            labels = f'url_class="{s["url_class"]}",mode="{s["mode"]}"'
+            for q, value in s["latency_s"].items():
+                quantile = int(q[1:]) / 100
+                lines.append(f'nba_scraper_fetch_latency_seconds{{{labels},quantile="{quantile}"}} {value}')
+            lines.append(f'nba_scraper_fetch_latency_seconds_sum{{{labels}}} {s["latency_sum_s"]}')
+            lines.append(f'nba_scraper_fetch_latency_seconds_count{{{labels}}} {s["requests"]}')
+        lines += [
+            "# HELP nba_scraper_fetch_bytes Bytes de resposta recebidos na última execução.",
+            "# TYPE nba_scraper_fetch_bytes gauge",
+        ]
+        lines += [
+            f'nba_scraper_fetch_bytes{{url_class="{s["url_class"]}",mode="{s["mode"]}"}} {s["bytes_total"]}'
+            for s in summary["series"]
+        ]
+        lines += [
+            "# HELP nba_scraper_last_run_timestamp_seconds Fim da última execução (epoch).",
+            "# TYPE nba_scraper_last_run_timestamp_seconds gauge",
+            f"nba_scraper_last_run_timestamp_seconds {time.time():.0f}",
+        ]
+        return lines
+
+    def export(self, json_path: Optional[str], prom_path: Optional[str]) -> None:
+        summary = self.summary()
+        for s in summary["series"]:
+            log.info(
+                f"  → Telemetria {s['url_class']}/{s['mode']}: {s['requests']} pedidos | "
+                f"sucesso {100 * s['success_rate']:.0f}% | p50 {s['latency_s']['p50']:.1f}s | "
+                f"p90 {s['latency_s']['p90']:.1f}s"
+            )
+        for path, content in (
+            (json_path, lambda: json.dumps(summary, indent=2, ensure_ascii=False)),
+            (prom_path, lambda: "\n".join(self._prometheus_lines(summary)) + "\n"),
+        ):
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(content())
+            os.replace(tmp, path)
+
+
 class NetworkClient:
     def __init__(self):
-        self.client    = httpx.AsyncClient(follow_redirects=True, timeout=60)
+        self.client    = self._build_client()
         self.semaphore = asyncio.Semaphore(Config.CONCURRENCY_LIMIT)
+        self.pacer     = AdaptivePacer(Config.PACING_BASE_DELAY, Config.PACING_MAX_DELAY)
+        self.modes     = FetchModeLearner.load(Config.FETCH_MODES_FILE)
+        self.cache     = PageCache(Config.PAGE_CACHE_DIR, Config.PAGE_TTL, Config.PAGE_CACHE_MAX_AGE)
+        # Sem chave ScrapingAnt o pedido é directo e não consome créditos
+        costs = Config.CREDIT_COST if Config.SCRAPINGANT_KEY else {False: 0, True: 0}
+        self.budget    = CreditBudget(Config.CREDITS_FILE, costs, Config.CREDIT_BUDGET_RUN, Config.CREDIT_BUDGET_DAY)
+        self.telemetry = FetchTelemetry()
+        # Por URL servida nesta execução: (modo, amostra registada ou None se veio da cache)
+        self.served: Dict[str, Tuple[bool, Optional[Tuple[str, str, int]]]] = {}
 
     async def fetch(self, url: str, retries: int = 2, use_browser: bool = False) -> Optional[str]:
         async with self.semaphore:
             for attempt in range(retries + 1):
+                t0 = time.perf_counter()
                 try:
+                    if not self.budget.try_charge(use_browser):
+                        log.warning(f"[BUDGET] Sem créditos para browser={use_browser}: {url[-40:]}")
+                        return None
                     target = self._prepare_url(url, use_browser=use_browser)
+                    await self.pacer.wait()
                     log.info(f"Fetch: {url[:60]}... (browser={use_browser})")
+                    t0 = time.perf_counter()
                     resp = await self.client.get(target)
+                    latency = time.perf_counter() - t0
                     
-                    if resp.status_code == 409 and attempt < retries:
-                        wait = 2 ** attempt
-                        log.warning(f"409 retry em {wait}s...")
-                        await asyncio.sleep(wait)
-                        continue
+                    if resp.status_code in AdaptivePacer.THROTTLE_STATUSES:
+                        self.pacer.penalize(resp.headers.get("Retry-After"))
+                        if attempt < retries:
+                            self.telemetry.record(url, use_browser, attempt, resp.status_code, latency,
+                                                  len(resp.content), f"throttle_{resp.status_code}",
+                                                  resp.http_version)
+                            wait = max(2 ** attempt, self.pacer.delay)
+                            log.warning(f"{resp.status_code} retry em {wait:.1f}s...")
+                            await asyncio.sleep(wait)
+                            continue
                         
+                    reason = f"http_{resp.status_code}" if resp.is_error and attempt < retries else None
+                    self.telemetry.record(url, use_browser, attempt, resp.status_code, latency,
+                                          len(resp.content), reason, resp.http_version)
                     resp.raise_for_status()
+                    self.pacer.reward()
                     return resp.text
                     
                 except httpx.HTTPStatusError as e:
@@ -94,10 +666,35 @@ class NetworkClient:
                         return None
                     await asyncio.sleep(1)
                 except Exception as e:
+                    self.telemetry.record(url, use_browser, attempt, "error", time.perf_counter() - t0,
+                                          retry_reason=f"network_{type(e).__name__}")
                     log.warning(f"Erro rede: {e}")
                     return None
             return None
 
+    @staticmethod
+    def _build_client(verify: Any = True) -> httpx.AsyncClient:
+        http2 = Config.HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401  (extra opcional: httpx[http2])
+            except ImportError:
+                log.warning("Pacote 'h2' ausente: a usar HTTP/1.1.")
+                http2 = False
+        limits = httpx.Limits(
+            max_connections=Config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.HTTP_KEEPALIVE,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            connect=Config.HTTP_CONNECT_TIMEOUT,
+            read=Config.HTTP_READ_TIMEOUT,
+            write=Config.HTTP_CONNECT_TIMEOUT,
+            pool=Config.HTTP_CONNECT_TIMEOUT,
+        )
+        return httpx.AsyncClient(follow_redirects=True, timeout=timeout, limits=limits, http2=http2,
+                                 verify=verify)
+
     def _prepare_url(self, url: str, use_browser: bool = False) -> str:
         if not Config.SCRAPINGANT_KEY:
             return url
@@ -114,72 +711,198 @@ class NetworkClient:
 
 
 # ─── Retry Helper ─────────────────────────────────────────────────────────────
-async def fetch_with_retry(net, url: str) -> Optional[str]:
-    log.info(f"[FETCH] {url[-60:]}")
-    html = await net.fetch(url, use_browser=True)
-    if html:
+async def fetch_with_retry(net, url: str, skip_modes: Set[bool] = frozenset()) -> Optional[str]:
+    """
+    Tenta os modos pela ordem aprendida (mais barato que já funcionou primeiro)
+    e repete o primeiro modo como tentativa final, como no fluxo original.
+    `skip_modes` exclui modos cujo HTML já se revelou inútil nesta execução.
+    """
+    if Config.OFFLINE:
+        html = net.cache.latest(url)
+        log.info(f"[OFFLINE] {url[-60:]} → {'cache' if html else 'ausente da cache'}")
         return html
 
-    await asyncio.sleep(2)
-    log.warning(f"[RETRY] browser=False → {url[-40:]}")
-    html = await net.fetch(url, use_browser=False)
-    if html:
-        return html
+    plan = [m for m in net.modes.plan(url) if m not in skip_modes]
+    if not plan:
+        log.error(f"[FAIL TOTAL] Nenhum modo de fetch restante: {url[-60:]}")
+        return None
+    for use_browser in plan:
+        html = net.cache.get(url, use_browser)
+        if html:
+            log.info(f"[CACHE] {url[-60:]} (browser={use_browser})")
+            net.served[url] = (use_browser, None)
+            return html
+
+    log.info(f"[FETCH] {url[-60:]}")
+    attempts = [m for m in plan + plan[:1] if net.budget.affordable(m)]
+    if not attempts:
+        log.error(f"[BUDGET] Orçamento de créditos esgotado. Ignorado: {url[-60:]}")
+        return None
+    if any(plan) and not any(attempts):
+        log.warning(f"[BUDGET] Orçamento curto: descida para browser=False → {url[-40:]}")
+    backoff = [2, 3]
+
+    for i, use_browser in enumerate(attempts):
+        if not net.budget.affordable(use_browser):
+            continue
+        if i > 0:
+            await asyncio.sleep(backoff[min(i - 1, len(backoff) - 1)])
+            label = "RETRY FINAL" if i == len(attempts) - 1 else "RETRY"
+            log.warning(f"[{label}] browser={use_browser} → {url[-40:]}")
+
+        t0 = time.perf_counter()
+        html = await net.fetch(url, use_browser=use_browser)
+        sample = None
+        if html or net.budget.affordable(use_browser):
+            # Recusas por orçamento não contam como falha do modo
+            sample = net.modes.record(url, use_browser, bool(html), time.perf_counter() - t0)
+        if html:
+            net.cache.put(url, use_browser, html)
+            net.served[url] = (use_browser, sample)
+            return html
 
-    await asyncio.sleep(3)
-    log.warning(f"[RETRY FINAL] browser=True → {url[-40:]}")
-    html = await net.fetch(url, use_browser=True)
+    log.error(f"[FAIL TOTAL] {url[-60:]}")
+    return None
 
-    if not html:
-        log.error(f"[FAIL TOTAL] {url[-60:]}")
 
-    return html
+def reject_served(net, url: str) -> Optional[bool]:
+    """
+    O HTML servido para `url` não tem o conteúdo esperado (página não renderizada):
+    retira-o da cache e, se veio de um fetch desta execução, marca essa amostra como
+    falha do modo. Devolve o modo que o serviu (None se desconhecido).
+    """
+    if not Config.OFFLINE:
+        net.cache.invalidate(url)
+    use_browser, sample = net.served.pop(url, (None, None))
+    if sample:
+        net.modes.reject(sample)
+    return use_browser
 
 
 # ─── Extracção ────────────────────────────────────────────────────────────────
+MATCH_HREF_RE = re.compile(r"/pt/basketball/m-(\d{2}-\d{2}-\d{4})-([^/?#]+)")
+
+# Filtros do extractor de artigos: um único regex pré-compilado por lista de gatilhos
+NOISE_TAGS    = ["button", "script", "style", "nav", "footer", "aside", "table", "form", "iframe", "ul", "ol", "a"]
+TEXT_TAGS     = frozenset({"p", "h2", "h3", "div", "span"})
+HEADER_TAGS   = frozenset({"h2", "h3"})
+WRAPPER_TAGS  = frozenset({"div", "span"})
+BLOCK_TAGS    = frozenset({"p", "h2", "h3", "div"})
+
+
+def _multi_pattern(terms) -> re.Pattern:
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
+BLACKLIST_RE = _multi_pattern([
+    "registre", "bônus", "clique aqui", "cadastre-se", "promoção", 
+    "termos e condições", "lucro garantido", "telegram", "whatsapp",
+    "1xbit", "bet365", "betano", "1xbet", "pin-up",
+    "palpite pago", "vip", "cookie",
+])
+
+STOP_TRIGGERS_RE = _multi_pattern([
+    "esta previsão vai ser correta", "total de votos", "bónus", "bônus", 
+    "odds para o jogo", "posição na tabela", "estatísticas h2h", 
+    "últimos jogos", "classificação", "outras previsões", "calcule seus",
+    "melhores odds", "welcome bonus",
+])
+
+IMMUNITY_TRIGGERS_RE = _multi_pattern(["previsão da redação", "nossa escolha", "prognóstico", "palpite"])
+
+# Tabelas de equipas (construídas uma vez; antes eram literais recriados a cada chamada)
+TEAM_TRI_CODES: Dict[str, str] = {
+    "atlanta hawks": "ATL", "boston celtics": "BOS", "brooklyn nets": "BKN",
+    "charlotte hornets": "CHA", "chicago bulls": "CHI", "cleveland cavaliers": "CLE",
+    "dallas mavericks": "DAL", "denver nuggets": "DEN", "detroit pistons": "DET",
+    "golden state warriors": "GSW", "houston rockets": "HOU", "indiana pacers": "IND",
+    "la clippers": "LAC", "los angeles clippers": "LAC", "la lakers": "LAL", "los angeles lakers": "LAL",
+    "memphis grizzlies": "MEM", "miami heat": "MIA", "milwaukee bucks": "MIL",
+    "minnesota timberwolves": "MIN", "new orleans pelicans": "NOP", "ny knicks": "NYK",
+    "new york knicks": "NYK", "oklahoma city thunder": "OKC", "orlando magic": "ORL",
+    "philadelphia 76ers": "PHI", "phoenix suns": "PHX", "portland trail blazers": "POR",
+    "sacramento kings": "SAC", "san antonio spurs": "SAS", "toronto raptors": "TOR",
+    "utah jazz": "UTA", "washington wizards": "WAS",
+}
+
+TEAM_PT_NAMES: Dict[str, str] = {
+    "Pistons": "Pistões", "Hornets": "Hornets", "Wizards": "Wizards",
+    "Heat": "Heat", "Hawks": "Hawks", "Cavaliers": "Cavaliers",
+    "Pacers": "Pacers", "76ers": "76ers", "Celtics": "Celtics",
+    "Pelicans": "Pelicans", "Knicks": "Knicks", "Raptors": "Raptors",
+    "Bulls": "Bulls", "Nets": "Nets", "Mavericks": "Mavericks",
+    "Spurs": "Spurs", "Nuggets": "Nuggets", "Thunder": "Thunder",
+    "Warriors": "Warriors", "Lakers": "Lakers", "Rockets": "Rockets",
+    "Trail Blazers": "Trail Blazers", "Kings": "Kings", "Suns": "Suns",
+    "Jazz": "Jazz", "Grizzlies": "Grizzlies", "Timberwolves": "Timberwolves",
+    "Bucks": "Bucks", "Magic": "Magic", "Clippers": "Clippers",
+}
+
+
+def _longest_first(terms) -> re.Pattern:
+    # Alternativas mais longas primeiro: "Hornets" vence "Nets" na mesma posição
+    return _multi_pattern(sorted(terms, key=len, reverse=True))
+
+
+TEAM_ALIAS_RE = _longest_first(TEAM_TRI_CODES)
+TEAM_NICKNAME_RE = _longest_first(TEAM_PT_NAMES)
+
+
+def find_team_mentions(text: str) -> List[str]:
+    """
+    Todas as equipas citadas num único varrimento do texto, por ordem de aparição.
+    Aliases da mesma franquia ("la lakers" / "los angeles lakers") contam uma vez.
+    """
+    seen: Set[str] = set()
+    teams: List[str] = []
+    for match in TEAM_ALIAS_RE.finditer(text.lower()):
+        alias = match.group(0)
+        tri = TEAM_TRI_CODES[alias]
+        if tri not in seen:
+            seen.add(tri)
+            teams.append(alias.title())
+    return teams
+
+
+# Parse parcial da listagem: o regex corre sobre o href bruto durante a tokenização,
+# e só as âncoras de partida (com img/spans filhos) chegam a ser construídas na árvore.
+MATCH_ANCHOR_STRAINER = SoupStrainer("a", href=MATCH_HREF_RE)
+
+
 class NBAExtractor:
-    
+    PARSER_FALLBACK = "html.parser"
+
+    def __init__(self, parser: Optional[str] = None, paths: Optional["ContainerPathCache"] = None):
+        self.parser = self._resolve_parser(parser or Config.HTML_PARSER)
+        self.paths  = paths
+
+    @classmethod
+    def _resolve_parser(cls, parser: str) -> str:
+        """Valida o backend do BeautifulSoup (lxml, html.parser, html5lib); cai para html.parser se indisponível."""
+        try:
+            BeautifulSoup("", parser)
+            return parser
+        except FeatureNotFound:
+            log.warning(f"Parser '{parser}' indisponível. A usar '{cls.PARSER_FALLBACK}'.")
+            return cls.PARSER_FALLBACK
+
+    def parse(self, html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        return BeautifulSoup(html, self.parser, parse_only=parse_only)
+
     @staticmethod
     def clean_team(name: str) -> str:
         return re.sub(r'\s*trends?$', '', name.split("#")[0], flags=re.I).strip()
 
     @staticmethod
     def get_tri_code(team: str) -> str:
-        mapping = {
-            "atlanta hawks": "ATL", "boston celtics": "BOS", "brooklyn nets": "BKN",
-            "charlotte hornets": "CHA", "chicago bulls": "CHI", "cleveland cavaliers": "CLE",
-            "dallas mavericks": "DAL", "denver nuggets": "DEN", "detroit pistons": "DET",
-            "golden state warriors": "GSW", "houston rockets": "HOU", "indiana pacers": "IND",
-            "la clippers": "LAC", "la lakers": "LAL", "los angeles lakers": "LAL",
-            "memphis grizzlies": "MEM", "miami heat": "MIA", "milwaukee bucks": "MIL",
-            "minnesota timberwolves": "MIN", "new orleans pelicans": "NOP", "ny knicks": "NYK",
-            "new york knicks": "NYK", "oklahoma city thunder": "OKC", "orlando magic": "ORL",
-            "philadelphia 76ers": "PHI", "phoenix suns": "PHX", "portland trail blazers": "POR",
-            "sacramento kings": "SAC", "san antonio spurs": "SAS", "toronto raptors": "TOR",
-            "utah jazz": "UTA", "washington wizards": "WAS",
-        }
-        return mapping.get(team.lower().strip(), "NBA")
+        return TEAM_TRI_CODES.get(team.lower().strip(), "NBA")
 
     @staticmethod
     def translate_team(team: str) -> str:
-        pt_names = {
-            "Pistons": "Pistões", "Hornets": "Hornets", "Wizards": "Wizards",
-            "Heat": "Heat", "Hawks": "Hawks", "Cavaliers": "Cavaliers",
-            "Pacers": "Pacers", "76ers": "76ers", "Celtics": "Celtics",
-            "Pelicans": "Pelicans", "Knicks": "Knicks", "Raptors": "Raptors",
-            "Bulls": "Bulls", "Nets": "Nets", "Mavericks": "Mavericks",
-            "Spurs": "Spurs", "Nuggets": "Nuggets", "Thunder": "Thunder",
-            "Warriors": "Warriors", "Lakers": "Lakers", "Rockets": "Rockets",
-            "Trail Blazers": "Trail Blazers", "Kings": "Kings", "Suns": "Suns",
-            "Jazz": "Jazz", "Grizzlies": "Grizzlies", "Timberwolves": "Timberwolves",
-            "Bucks": "Bucks", "Magic": "Magic", "Clippers": "Clippers",
-        }
-        for en, pt in pt_names.items():
-            if en in team:
-                return pt
-        return team
+        match = TEAM_NICKNAME_RE.search(team)
+        return TEAM_PT_NAMES[match.group(0)] if match else team
 
-    def _resolve_anomalous_teams(self, game: GameData) -> None:
+    def _resolve_anomalous_teams(self, game: GameRecord) -> None:
         """
         V7.0.3: Análise Semântica NLP. Substitui "Winner of Game X" pelas equipas reais citadas no texto.
         """
@@ -193,36 +916,17 @@ class NBAExtractor:
         if not (home_bad or away_bad):
             return
             
-        text_lower = game.tactical_prediction.lower()
-        
-        nba_teams = [
-            "atlanta hawks", "boston celtics", "brooklyn nets", "charlotte hornets",
-            "chicago bulls", "cleveland cavaliers", "dallas mavericks", "denver nuggets",
-            "detroit pistons", "golden state warriors", "houston rockets", "indiana pacers",
-            "la clippers", "los angeles lakers", "la lakers", "memphis grizzlies", "miami heat",
-            "milwaukee bucks", "minnesota timberwolves", "new orleans pelicans",
-            "new york knicks", "ny knicks", "oklahoma city thunder", "orlando magic", "philadelphia 76ers",
-            "phoenix suns", "portland trail blazers", "sacramento kings", "san antonio spurs",
-            "toronto raptors", "utah jazz", "washington wizards"
-        ]
-        
-        found_teams = []
-        for team in nba_teams:
-            if team in text_lower:
-                found_teams.append(team.title())
-                
-        # Deduplicação
-        unique_teams = list(dict.fromkeys(found_teams))
+        unique_teams = find_team_mentions(game.tactical_prediction)
         
         if len(unique_teams) >= 2:
             if home_bad and not away_bad:
                 for t in unique_teams:
-                    if t.lower() not in game.away_team.lower():
+                    if t.lower() not in game.away_team.lower() and TEAM_TRI_CODES[t.lower()] != game.away_tri:
                         game.home_team = t
                         break
             elif away_bad and not home_bad:
                 for t in unique_teams:
-                    if t.lower() not in game.home_team.lower():
+                    if t.lower() not in game.home_team.lower() and TEAM_TRI_CODES[t.lower()] != game.home_tri:
                         game.away_team = t
                         break
             elif home_bad and away_bad:
@@ -237,21 +941,24 @@ class NBAExtractor:
             
             log.info(f"  → Substituição Semântica Aplicada: {game.home_team} vs {game.away_team}")
 
-    def extract_games_list(self, html: str, target_date: str) -> List[GameData]:
-        soup = BeautifulSoup(html, "html.parser")
+    def extract_games_list(self, html: str, target_date: Optional[str] = None, days: int = 1) -> List[GameRecord]:
+        """
+        Jogos da listagem para `target_date` e os `days - 1` dias seguintes (modo multi-dia);
+        sem data alvo devolve todos os dias presentes na página. Cada jogo fica com a sua
+        própria data BRT; jogos sem hora usam a mesma regra em todos os modos.
+        """
+        soup = self.parse(html, parse_only=MATCH_ANCHOR_STRAINER)
         games = []
         
-        pattern = re.compile(r"/pt/basketball/m-(\d{2}-\d{2}-\d{4})-([^/?#]+)")
         seen_slugs: set[str] = set()
 
-        dt_target = datetime.strptime(target_date, "%Y-%m-%d").date()
+        targets = None
+        if target_date:
+            dt_target = datetime.strptime(target_date, "%Y-%m-%d").date()
+            targets = {dt_target + timedelta(days=i) for i in range(max(1, days))}
         
         for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if "/m-" not in href:
-                continue
-
-            match = pattern.search(href)
+            match = MATCH_HREF_RE.search(a["href"])
             if not match:
                 continue
 
@@ -283,11 +990,13 @@ class NBAExtractor:
                 game_brt_date = url_date_obj - timedelta(days=1)
                 game_brt_time = "20:00"
 
-            if game_brt_date != dt_target:
-                if not time_match and url_date_obj == dt_target:
-                    pass
-                else:
-                    continue
+            if targets is None or game_brt_date in targets:
+                game_date = game_brt_date.isoformat()
+            elif not time_match and url_date_obj in targets:
+                # Sem hora a data BRT é incerta (véspera ou dia do URL): aceita a do URL
+                game_date = url_date_obj.isoformat()
+            else:
+                continue
 
             clean_teams = raw_slug.replace("-prediction", "")
             slug_clean = f"m-{url_date_str}-{clean_teams}"
@@ -324,9 +1033,9 @@ class NBAExtractor:
 
             conf_match = re.search(r"(\d{1,3})%", node_text_lower)
 
-            games.append(GameData(
+            games.append(GameRecord(
                 slug=slug_clean,
-                game_date=target_date,
+                game_date=game_date,
                 game_time_brt=game_brt_time,
                 home_team=home,
                 away_team=away,
@@ -341,78 +1050,86 @@ class NBAExtractor:
         log.info(f"  → Matriz Matemática (V7.0.3): {len(games)} partidas isoladas.")
         return games
 
-    def extract_full_prediction(self, html: str, game: GameData) -> None:
+    def extract_full_prediction(self, html: str, game: GameRecord) -> None:
         if not html:
             return
             
-        soup = BeautifulSoup(html, "html.parser")
-        game.tactical_prediction = self._extract_text_v3(soup)
+        hint = self.paths.get(game.source_url) if self.paths else None
+        self._apply_prediction(game, hint, *extract_prediction(html, self.parser, hint))
+
+    async def extract_full_prediction_async(self, html: str, game: GameRecord, executor: Optional[Executor]) -> None:
+        """
+        Variante para o orquestrador: o parsing (CPU) corre no pool de processos, sem bloquear
+        os restantes fetches no event loop. Sem executor, cai para a versão síncrona.
+        """
+        if not html:
+            return
+        if executor is None:
+            self.extract_full_prediction(html, game)
+            return
+
+        hint = self.paths.get(game.source_url) if self.paths else None
+        loop = asyncio.get_running_loop()
+        text, path = await loop.run_in_executor(executor, extract_prediction, html, self.parser, hint)
+        self._apply_prediction(game, hint, text, path)
+
+    def _apply_prediction(self, game: GameRecord, hint: Optional[list], text: Optional[str], path: Optional[list]) -> None:
+        game.tactical_prediction = text
+        if self.paths and path:
+            self.paths.learn(game.source_url, hint, path)
         log.info(f"  → Texto extraído: {len(game.tactical_prediction) if game.tactical_prediction else 0} chars")
         
         # Activa o Scanner Semântico para corrigir nomes TBD via leitura de artigo
         self._resolve_anomalous_teams(game)
 
-    def _process_text_container(self, container, min_length=150) -> Optional[str]:
+    def _process_text_container(self, container, min_length=150, sources: Optional[List[Tag]] = None) -> Optional[str]:
+        """`sources`, se fornecida, recebe as tags que contribuíram texto (para aprender o contentor)."""
         if not container:
             return None
             
-        for elem in container.find_all(["button", "script", "style", "nav", "footer", "aside", "table", "form", "iframe", "ul", "ol", "a"]):
+        for elem in container.find_all(NOISE_TAGS):
             try:
                 elem.decompose()
             except:
                 pass
         
         sections = []
+        seen: Set[str] = set()
         last_text = ""
         capture_immunity = False
         
-        blacklist = {
-            "registre", "bônus", "clique aqui", "cadastre-se", "promoção", 
-            "termos e condições", "lucro garantido", "telegram", "whatsapp",
-            "1xbit", "bet365", "betano", "1xbet", "pin-up",
-            "palpite pago", "vip", "cookie"
-        }
-        
-        stop_triggers = [
-            "esta previsão vai ser correta", "total de votos", "bónus", "bônus", 
-            "odds para o jogo", "posição na tabela", "estatísticas h2h", 
-            "últimos jogos", "classificação", "outras previsões", "calcule seus",
-            "melhores odds", "welcome bonus"
-        ]
-        
-        for elem in container.find_all(["p", "h2", "h3", "div", "span"]):
-            
-            if elem.name in ["div", "span"] and elem.find(["p", "h2", "h3", "div"]):
-                continue
-                
+        for elem in self._text_candidates(container):
             text = elem.get_text(separator=" ", strip=True)
             if not text: 
                 continue
                 
             text_lower = text.lower()
-            is_header = elem.name in ["h2", "h3"]
+            is_header = elem.name in HEADER_TAGS
             
-            if any(stop in text_lower for stop in stop_triggers):
+            if STOP_TRIGGERS_RE.search(text_lower):
                 capture_immunity = False
                 continue
                 
-            if is_header and any(trigger in text_lower for trigger in ["previsão da redação", "nossa escolha", "prognóstico", "palpite"]):
+            if is_header and IMMUNITY_TRIGGERS_RE.search(text_lower):
                 capture_immunity = True
                 sections.append(f"\n{text}")
+                seen.add(sections[-1])
+                if sources is not None:
+                    sources.append(elem)
                 last_text = text
                 continue
                 
             if not capture_immunity and not is_header:
                 if len(text) < 45: 
                     continue
-                if any(b in text_lower for b in blacklist):
+                if BLACKLIST_RE.search(text_lower):
                     continue
                 num_count = sum(c.isdigit() for c in text)
                 density = num_count / len(text) if len(text) > 0 else 0
                 if density > 0.12: 
                     continue
             
-            if text == last_text or text in sections:
+            if text == last_text or text in seen:
                 continue
                 
             last_text = text
@@ -421,43 +1138,219 @@ class NBAExtractor:
                 sections.append(f"\n{text}")
             else:
                 sections.append(text)
+            seen.add(sections[-1])
+            if sources is not None:
+                sources.append(elem)
         
         result = "\n\n".join(sections).strip()
         result = re.sub(r'\n{3,}', '\n\n', result)
         
         return result if len(result) >= min_length else None
 
+    @staticmethod
+    def _text_candidates(container) -> List[Tag]:
+        """
+        Uma única travessia do DOM: lista as tags em pré-ordem e, percorrendo-a ao contrário,
+        marca quais contêm blocos (p/h2/h3/div) — substitui o `elem.find` por div/span.
+        """
+        tags = [node for node in container.descendants if isinstance(node, Tag)]
+        has_block: Set[int] = set()
+        for tag in reversed(tags):
+            if tag.name in BLOCK_TAGS or id(tag) in has_block:
+                has_block.add(id(tag.parent))
+        return [
+            tag for tag in tags
+            if tag.name in TEXT_TAGS
+            and not (tag.name in WRAPPER_TAGS and id(tag) in has_block)
+        ]
+
     def _extract_text_v3(self, soup: BeautifulSoup) -> Optional[str]:
+        return self._extract_article(soup)[0]
+
+    def _extract_article(self, soup: BeautifulSoup, path_hint: Optional[list] = None) -> Tuple[Optional[str], Optional[list]]:
+        """
+        Tenta primeiro o contentor aprendido (`path_hint`); só se falhar corre a varredura
+        heurística completa a partir de main/body. Devolve (texto, caminho do contentor).
+        """
+        if path_hint:
+            node = resolve_dom_path(soup, path_hint)
+            if node is not None:
+                text = self._process_text_container(node, min_length=300)
+                if text:
+                    return text, path_hint
+
         main_content = soup.find("main") or soup.find("body")
         if main_content:
-            text = self._process_text_container(main_content, min_length=300)
+            sources: List[Tag] = []
+            text = self._process_text_container(main_content, min_length=300, sources=sources)
             if text:
-                return text
-        return None
+                return text, dom_path(common_ancestor(sources))
+        return None, None
+
+
+def dom_path(node: Tag) -> list:
+    """Caminho estável da raiz até `node`: pares [tag, índice entre irmãos com a mesma tag]."""
+    path = []
+    while node is not None and node.parent is not None:
+        path.append([node.name, len(node.find_previous_siblings(node.name))])
+        node = node.parent
+    return path[::-1]
+
+
+def resolve_dom_path(soup: BeautifulSoup, path: list) -> Optional[Tag]:
+    node = soup
+    for name, index in path:
+        node = node.find_all(name, recursive=False)
+        if index >= len(node):
+            return None
+        node = node[index]
+    return node
+
+
+def common_ancestor(elements: List[Tag]) -> Tag:
+    """Menor ancestral comum (o contentor mais estreito que ainda cobre todo o texto extraído)."""
+    chain = list(reversed([elements[0], *elements[0].parents]))
+    depth = len(chain)
+    for elem in elements[1:]:
+        ancestors = list(reversed([elem, *elem.parents]))
+        depth = next(
+            (i for i, (a, b) in enumerate(zip(chain[:depth], ancestors)) if a is not b),
+            min(depth, len(ancestors)),
+        )
+    return chain[depth - 1]
+
+
+class ContainerPathCache:
+    """
+    Caminho DOM do contentor de artigo que funcionou, por site. Enquanto o template
+    se mantiver, as páginas seguintes vão directas a esse nó; persiste entre execuções.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.paths: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str) -> "ContainerPathCache":
+        cache = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cache.paths = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            log.warning(f"Cache de contentores ilegível ({e}). A recomeçar do zero.")
+        return cache
+
+    @staticmethod
+    def _site(url: str) -> str:
+        return urlparse(url).netloc
+
+    def get(self, url: str) -> Optional[list]:
+        return self.paths.get(self._site(url))
+
+    def learn(self, url: str, hint: Optional[list], path: list) -> None:
+        if hint == path:
+            self.hits += 1
+            return
+        self.misses += 1
+        self.paths[self._site(url)] = path
+        log.info(f"  → Contentor aprendido: {'>'.join(name for name, _ in path)}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.paths, f)
+        log.info(f"  → Contentor em cache: {self.hits} acertos | {self.misses} varreduras completas")
+
+
+def extract_prediction(html: str, parser: str, path_hint: Optional[list] = None) -> Tuple[Optional[str], Optional[list]]:
+    """Parsing + extracção do artigo; função de topo para ser serializável pelo ProcessPoolExecutor."""
+    ext = NBAExtractor(parser)
+    return ext._extract_article(ext.parse(html), path_hint)
 
 
 # ─── Persistência ─────────────────────────────────────────────────────────────
 class DatabaseManager:
     def __init__(self):
         self.sb: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
-        self.target_columns = {
-            "slug", "game_date", "game_time_brt",
-            "home_team", "away_team", "home_team_pt", "away_team_pt",
-            "home_tri", "away_tri", "source_url", "confidence_pct",
-            "game_status", "scraped_at", "tactical_prediction"
-        }
 
-    def get_cached(self) -> Dict[str, dict]:
-        res = self.sb.table("nba_games_schedule").select("slug,game_date,tactical_prediction").execute()
+    PAGE_SIZE  = 1000   # limite de linhas por pedido PostgREST
+    SLUG_CHUNK = 100    # slugs por filtro in.() para manter o URL curto
+
+    def _select_paginated(self, columns: str, slugs: List[str], with_text: bool = False) -> List[dict]:
+        """Selecção restrita aos slugs indicados, paginada com ordem estável por slug."""
+        rows: List[dict] = []
+        for i in range(0, len(slugs), self.SLUG_CHUNK):
+            chunk = slugs[i:i + self.SLUG_CHUNK]
+            start = 0
+            while True:
+                query = self.sb.table("nba_games_schedule").select(columns).in_("slug", chunk)
+                if with_text:
+                    query = query.not_.is_("tactical_prediction", "null").neq("tactical_prediction", "")
+                res = query.order("slug").range(start, start + self.PAGE_SIZE - 1).execute()
+                rows.extend(res.data)
+                if len(res.data) < self.PAGE_SIZE:
+                    break
+                start += self.PAGE_SIZE
+        return rows
+
+    def get_cached(self, slugs: List[str]) -> Dict[str, dict]:
+        """
+        Estado da cache apenas para os slugs da rodada. O texto táctico nunca é descarregado:
+        `has_text` resulta de uma segunda consulta que devolve só os slugs com texto.
+        """
+        slugs = sorted(set(slugs))
+        if not slugs:
+            return {}
+        rows = self._select_paginated("slug,game_date,content_hash", slugs)
+        with_text = {row["slug"] for row in self._select_paginated("slug", slugs, with_text=True)}
         return {
             row["slug"]: {
                 "game_date": row.get("game_date"),
-                "has_text": bool(row.get("tactical_prediction")),
+                "has_text": row["slug"] in with_text,
+                "content_hash": row.get("content_hash"),
             }
-            for row in res.data
+            for row in rows
         }
 
-    def upsert_games(self, games: List[GameData]):
+    UPSERT_CHUNK   = 50
+    UPSERT_RETRIES = 3
+    HASH_EXCLUDED  = {"scraped_at", "content_hash"}
+
+    @classmethod
+    def content_hash(cls, row: Dict[str, Any], text_digest: Optional[str] = None) -> str:
+        """
+        Hash estável da linha; ignora `scraped_at` para não marcar re-capturas idênticas.
+        Duas metades de 32 hex: metadados da listagem + texto táctico. Uma linha só de
+        metadados reaproveita a metade do texto já armazenado (`text_digest`).
+        """
+        payload = {k: v for k, v in row.items() if k not in cls.HASH_EXCLUDED and k != "tactical_prediction"}
+        meta_digest = hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:32]
+        if text_digest is None:
+            text_digest = hashlib.sha256((row.get("tactical_prediction") or "").encode("utf-8")).hexdigest()[:32]
+        return meta_digest + text_digest
+
+    def _upsert_chunk(self, rows: List[Dict[str, Any]]) -> bool:
+        for attempt in range(self.UPSERT_RETRIES):
+            try:
+                self.sb.table("nba_games_schedule").upsert(rows, on_conflict="slug").execute()
+                return True
+            except Exception as e:
+                log.warning(f"Lote de {len(rows)} falhou (tentativa {attempt + 1}/{self.UPSERT_RETRIES}): {e}")
+                if attempt < self.UPSERT_RETRIES - 1:
+                    time.sleep(2 ** attempt)
+        return False
+
+    def upsert_games(self, games: List[GameRecord], cached: Optional[Dict[str, dict]] = None):
+        """
+        Envia apenas linhas novas ou alteradas (comparação por `content_hash`), em lotes com retry.
+        `cached` é o resultado de `get_cached`; sem ele, o estado armazenado é consultado aqui.
+        """
         seen = set()
         unique = []
         for g in games:
@@ -468,86 +1361,159 @@ class DatabaseManager:
         if not unique:
             log.info("Nenhum registo persistente válido.")
             return
+
+        if cached is None:
+            cached = self.get_cached([g.slug for g in unique])
         
         rows = []
+        meta_rows = []
+        unchanged = 0
         for g in unique:
-            row: Dict[str, Any] = {}
-            for field in self.target_columns:
-                row[field] = getattr(g, field, None)
-            
+            try:
+                row = game_to_row(GameData.model_validate(game_to_row(g)))
+            except ValidationError as e:
+                log.error(f"  → {g.slug}: registo inválido descartado ({e.error_count()} erros): {e}")
+                continue
+
+            stored = cached.get(g.slug, {})
+            stored_hash = stored.get("content_hash") or ""
+            metadata_only = stored.get("has_text") and not row.get("tactical_prediction")
+            if metadata_only:
+                # Jogo não reprocessado nesta execução: envia só os metadados da listagem,
+                # sem sobrescrever o texto já gravado
+                del row["tactical_prediction"]
+                text_digest = stored_hash[32:] if len(stored_hash) == 64 else "0" * 32
+                row["content_hash"] = self.content_hash(row, text_digest)
+            else:
+                row["content_hash"] = self.content_hash(row)
+
+            if stored_hash == row["content_hash"]:
+                unchanged += 1
+                continue
+
+            if metadata_only:
+                meta_rows.append(row)
+                continue
             if not row.get("tactical_prediction"):
                 log.warning(f"  → {g.slug}: SEM tactical_prediction processada.")
-            
             rows.append(row)
-        
-        try:
-            self.sb.table("nba_games_schedule").upsert(rows, on_conflict="slug").execute()
-            for r in rows:
-                text_ok = "✓" if r.get("tactical_prediction") else "✗"
+
+        failed = 0
+        # Lotes homogéneos: o upsert do PostgREST exige as mesmas colunas em todas as linhas
+        batches = [rows[i:i + self.UPSERT_CHUNK] for i in range(0, len(rows), self.UPSERT_CHUNK)]
+        batches += [meta_rows[i:i + self.UPSERT_CHUNK] for i in range(0, len(meta_rows), self.UPSERT_CHUNK)]
+        for n, chunk in enumerate(batches, 1):
+            if not self._upsert_chunk(chunk):
+                failed += len(chunk)
+                log.error(f"Erro na matriz de persistência de dados: lote {n} descartado.")
+                continue
+            for r in chunk:
+                text_ok = "✓" if r.get("tactical_prediction") else ("=" if "tactical_prediction" not in r else "✗")
                 log.info(f"  → Registado: {r['slug'][:40]} | Vector Textual: {text_ok}")
-        except Exception as e:
-            log.error(f"Erro na matriz de persistência de dados: {e}")
-            raise
+
+        changed = len(rows) + len(meta_rows)
+        log.info(
+            f"  → Persistência: {unchanged} inalterados | {changed - failed} alterados "
+            f"({len(meta_rows)} só metadados) | {failed} falhados"
+        )
+        if failed:
+            raise RuntimeError(f"{failed} registos não persistidos após {self.UPSERT_RETRIES} tentativas.")
 
 
 # ─── Orquestrador ─────────────────────────────────────────────────────────────
 async def main():
     log.info("═══ Motor Activo: Kimi/Replicante V7.0.3 (Análise Semântica NLP) ═══")
 
-    if not Config.SCRAPINGANT_KEY:
+    if not Config.SCRAPINGANT_KEY and not Config.OFFLINE:
         log.error("SCRAPINGANT_API_KEY crítica não fornecida.")
         return
 
     net = NetworkClient()
-    ext = NBAExtractor()
-    db = DatabaseManager()
+    ext = NBAExtractor(paths=ContainerPathCache.load(Config.CONTAINER_PATHS_FILE))
+    db = DatabaseManager() if Config.DB_ENABLED else None
+    pool = ProcessPoolExecutor(max_workers=Config.PARSE_WORKERS) if Config.PARSE_WORKERS > 0 else None
 
     try:
-        html_list = await fetch_with_retry(net, Config.PREDICTIONS_URL)
-        if not html_list:
-            log.error("Excepção não resolvida na captura da matriz raiz.")
-            return
+        # Uma listagem sem âncoras de jogos é uma página não renderizada, não um dia vazio:
+        # penaliza o modo que a serviu e tenta o seguinte do plano
+        failed_modes: Set[bool] = set()
+        while True:
+            html_list = await fetch_with_retry(net, Config.PREDICTIONS_URL, failed_modes)
+            if not html_list:
+                log.error("Excepção não resolvida na captura da matriz raiz.")
+                return
+            if Config.OFFLINE or MATCH_HREF_RE.search(html_list):
+                break
+            mode = reject_served(net, Config.PREDICTIONS_URL)
+            log.warning(f"[LISTAGEM] Sem âncoras de jogos (browser={mode}): página não renderizada.")
+            if mode is None:
+                return
+            failed_modes.add(mode)
 
-        today = datetime.now(BRT).strftime("%Y-%m-%d")
-        games = ext.extract_games_list(html_list, today)
+        today = Config.TARGET_DATE or datetime.now(BRT).strftime("%Y-%m-%d")
+        article_cutoff = today
+        if Config.MULTI_DAY:
+            games = ext.extract_games_list(html_list, today, days=Config.MULTI_DAY_HORIZON + 1)
+            article_cutoff = (
+                datetime.strptime(today, "%Y-%m-%d") + timedelta(days=Config.MULTI_DAY_ARTICLE_DAYS)
+            ).strftime("%Y-%m-%d")
+            per_day: Dict[str, int] = {}
+            for g in games:
+                per_day[g.game_date] = per_day.get(g.game_date, 0) + 1
+            log.info(f"  → Modo multi-dia: {dict(sorted(per_day.items()))} | artigos até {article_cutoff}")
+        else:
+            games = ext.extract_games_list(html_list, today)
 
         if not games:
             log.info(f"Aguardando novos eventos agendados para {today}.")
             return
 
-        cache = db.get_cached()
+        # Offline sem escrita: nenhum acesso ao Supabase, todos os jogos são reprocessados
+        cache = db.get_cached([g.slug for g in games]) if db else {}
 
-        async def process(game: GameData) -> GameData:
+        # Prioridade (listagem já capturada): artigos em falta primeiro, depois por tipoff.
+        # Com orçamento curto, os créditos restantes vão para os jogos que mais precisam.
+        games.sort(key=lambda g: (cache.get(g.slug, {}).get("has_text", False), g.game_date, g.game_time_brt))
+
+        async def process(game: GameRecord) -> GameRecord:
             cached = cache.get(game.slug, {})
             needs_update = not cached.get("has_text")
             
-            if not needs_update and cached.get("game_date") == game.game_date:
+            if not Config.OFFLINE and not needs_update and cached.get("game_date") == game.game_date:
                 log.info(f"[{game.away_tri} @ {game.home_tri}] → Ciclo ignorado. Cache preenchido.")
                 return game
 
+            if game.game_date > article_cutoff:
+                log.info(f"[{game.away_tri} @ {game.home_tri}] → {game.game_date}: só agenda (artigo fora da janela).")
+                return game
+
             pred_url = f"{game.source_url}-prediction"
             log.info(f"[{game.away_tri} @ {game.home_tri}] → Executando injecção de rede para vector táctico...")
             
             html = await fetch_with_retry(net, pred_url)
             
             if html:
-                ext.extract_full_prediction(html, game)
+                await ext.extract_full_prediction_async(html, game, pool)
                 if not game.tactical_prediction:
+                    # Artigo ainda não publicado (ou HTML sem render): não manter o placeholder
+                    # durante o TTL longo nem contar o modo como bem-sucedido
+                    reject_served(net, pred_url)
                     log.warning(f"[{game.away_tri} @ {game.home_tri}] → Vector não passível de reconstrução. Excluído.")
             else:
                 log.warning(f"[{game.away_tri} @ {game.home_tri}] → 404/Timeout no processamento do HTML.")
 
             return game
 
-        results = []
-        for g in games:
+        async def guarded(game: GameRecord):
+            # Isolamento por jogo: uma falha não cancela as restantes tarefas
             try:
-                result = await process(g)
-                results.append(result)
+                return await process(game)
             except Exception as e:
-                results.append(e)
-                log.error(f"[{g.away_tri} @ {g.home_tri}] → Falha Sistémica: {e}")
-            await asyncio.sleep(4)
+                log.error(f"[{game.away_tri} @ {game.home_tri}] → Falha Sistémica: {e}")
+                return e
+
+        # Concorrência limitada pelo semáforo do NetworkClient; o ritmo é ditado pelo AdaptivePacer
+        results = await asyncio.gather(*(guarded(g) for g in games))
 
         valid = []
         for g, r in zip(games, results):
@@ -556,14 +1522,27 @@ async def main():
             else:
                 valid.append(r)
 
-        if valid:
-            db.upsert_games(valid)
+        if valid and not db:
+            log.info(f"[OFFLINE] {len(valid)} registos não persistidos (NBA_SCRAPER_OFFLINE_WRITE=1 para gravar).")
+        elif valid:
+            db.upsert_games(valid, cache)
 
         with_text = sum(1 for g in valid if g.tactical_prediction)
         
         log.info(f"═══ Auditoria de Saída: {len(valid)} nodes | Vectores Limpos: {with_text} ═══")
 
     finally:
+        net.modes.report()
+        net.modes.save()
+        net.budget.report()
+        net.budget.save()
+        net.telemetry.export(Config.TELEMETRY_JSON, Config.TELEMETRY_PROM)
+        if not Config.OFFLINE:
+            # Offline só lê a cache: gravar o índice podaria as páginas que o modo reutiliza
+            net.cache.save()
+        ext.paths.save()
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
         await net.close()
 
 if __name__ == "__main__":
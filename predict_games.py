@@ -8,6 +8,8 @@ import pytz
 from supabase import create_client
 from groq import Groq
 
+from monte_carlo import run_slate_simulation
+
 # ==========================================
 # 1. INICIALIZAÇÃO DE INFRAESTRUTURA
 # ==========================================
@@ -458,6 +460,10 @@ DIRETRIZES OBRIGATÓRIAS DE ANÁLISE:
 4. HANDICAPS (REGRAS OBRIGATÓRIAS):
    - EVITE linhas exatas de +5.5. Prefira extremidades (+10 underdog claro, -5 favorito sólido).
 
+5. SIMULAÇÃO MONTE CARLO (CALIBRAÇÃO):
+   - Quando "Simulacao_Monte_Carlo" estiver presente, use prob_cobertura_casa / prob_over como base de "confianca".
+   - Não contrarie a simulação sem um fator explícito (lesão de elite, H2H) que a justifique.
+
 SAÍDA OBRIGATÓRIA (JSON Estrito):
 {
   "palpite_principal": "string (ex: OVER 225.5, Boston -5, Philadelphia +10)",
@@ -482,11 +488,14 @@ def build_analysis_payload(
     home_defense: dict,
     away_defense: dict,
     home_db: dict,
-    away_db: dict
+    away_db: dict,
+    market_odds: dict = None,
+    simulation: dict = None
 ) -> dict:
     """
     FIX: Responsabilidade de montagem do payload extraída de analyze_game,
     facilitando testes unitários e reduzindo o tamanho da função principal.
+    `market_odds` e `simulation` são pré-calculados para a rodada inteira.
     """
     home = game['home']['displayName']
     away = game['away']['displayName']
@@ -508,7 +517,10 @@ def build_analysis_payload(
 
     home_advantage_factor = "ALTO" if home_stats.get('is_contender') else "NORMAL"
 
-    return {
+    if market_odds is None:
+        market_odds = get_market_odds(home, away)
+
+    payload = {
         "Confronto": f"{home} vs {away}",
         "Metricas_Avancadas_14_Dias_Databallr": {
             "Home_Adv": {
@@ -569,13 +581,18 @@ def build_analysis_payload(
             "criterio": "Apenas jogadores nota >= 7.0 ou All-Star"
         },
         "H2H_Recente": h2h,
-        "Market_Odds": get_market_odds(home, away),
+        "Market_Odds": market_odds,
         "Regras_Handicap": {
             "evitar": "+5.5 (armadilha estatística)",
             "preferir": "+10 (underdog claro) ou -5 (favorito sólido)"
         }
     }
 
+    if simulation:
+        payload["Simulacao_Monte_Carlo"] = simulation
+
+    return payload
+
 
 def call_groq_with_retry(payload: dict) -> dict:
     """
@@ -610,7 +627,9 @@ def analyze_game(
     home_defense: dict,
     away_defense: dict,
     home_db: dict,
-    away_db: dict
+    away_db: dict,
+    market_odds: dict = None,
+    simulation: dict = None
 ):
     """
     FIX: Função refatorada — delega montagem de payload e chamada à IA
@@ -624,7 +643,8 @@ def analyze_game(
         home_stats, away_stats,
         home_momentum, away_momentum,
         home_defense, away_defense,
-        home_db, away_db
+        home_db, away_db,
+        market_odds, simulation
     )
 
     try:
@@ -654,7 +674,8 @@ if __name__ == "__main__":
     print("🧠 Carregando tensores de eficiência Databallr (14 Dias)...")
     databallr_matrix = get_databallr_matrix()
 
-    predictions = []
+    # Fase 1: coleta de dados por jogo (entrada da simulação da rodada inteira)
+    slate = []
 
     for game in games:
         home_full = game['home']['displayName']
@@ -667,29 +688,51 @@ if __name__ == "__main__":
 
         print(f"\n🔎 Processando: {home_full} vs {away_full} (ID: {game_id})")
 
-        # Coleta paralela de dados por time
-        home_stats    = get_team_stats(home_id)
-        away_stats    = get_team_stats(away_id)
-        home_defense  = get_team_defense_metrics(home_id)
-        away_defense  = get_team_defense_metrics(away_id)
-        home_momentum = get_last_games(home_id)
-        away_momentum = get_last_games(away_id)
-        h2h           = extract_h2h(home_id, away_id)
-        home_db       = match_databallr_stats(home_full, databallr_matrix)
-        away_db       = match_databallr_stats(away_full, databallr_matrix)
+        slate.append({
+            "game": game,
+            "game_id": game_id,
+            "home_stats":    get_team_stats(home_id),
+            "away_stats":    get_team_stats(away_id),
+            "home_defense":  get_team_defense_metrics(home_id),
+            "away_defense":  get_team_defense_metrics(away_id),
+            "home_momentum": get_last_games(home_id),
+            "away_momentum": get_last_games(away_id),
+            "h2h":           extract_h2h(home_id, away_id),
+            "home_db":       match_databallr_stats(home_full, databallr_matrix),
+            "away_db":       match_databallr_stats(away_full, databallr_matrix),
+            "odds":          get_market_odds(home_full, away_full),
+        })
+
+    # Fase 2: Monte Carlo vetorizado sobre a rodada inteira (jogos x simulações)
+    print(f"\n🎲 Simulando {len(slate)} confrontos (Monte Carlo vetorizado)...")
+    simulations = run_slate_simulation(slate)
+
+    predictions = []
+
+    for item, simulation in zip(slate, simulations):
+        game = item["game"]
+        game_id = item["game_id"]
+        home_full = game['home']['displayName']
+        away_full = game['away']['displayName']
+        home_momentum = item["home_momentum"]
+        away_momentum = item["away_momentum"]
+        h2h = item["h2h"]
 
         result = analyze_game(
             game, inj_monitor, h2h,
-            home_stats, away_stats,
+            item["home_stats"], item["away_stats"],
             home_momentum, away_momentum,
-            home_defense, away_defense,
-            home_db, away_db
+            item["home_defense"], item["away_defense"],
+            item["home_db"], item["away_db"],
+            item["odds"], simulation
         )
 
         if not result:
             print(f"⚠️ Análise ignorada para {home_full} vs {away_full}.")
             continue
 
+        result["simulacao_monte_carlo"] = simulation
+
         record = {
             "id": game_id,
             "date": date_iso,
@@ -50,3 +50,7 @@ ON nba_injured_players FOR ALL
 TO service_role
 USING (true)
 WITH CHECK (true);
+
+-- Agenda de jogos (nba_scraper.py): hash de conteúdo para upserts incrementais
+ALTER TABLE nba_games_schedule ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+COMMENT ON COLUMN nba_games_schedule.content_hash IS 'SHA-256 do conteúdo da linha (exceto scraped_at); linhas inalteradas não são reenviadas';